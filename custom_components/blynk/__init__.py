@@ -3,28 +3,30 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import timedelta
+import sys
 from typing import Any
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
+import aiohttp
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE, Platform
+from homeassistant.core import Event, HomeAssistant
 from homeassistant.helpers.typing import ConfigType
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-    UpdateFailed,
-)
+from homeassistant.util import ssl as ssl_util
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .blynk_api import BlynkCloudAPI
+from .coordinator import BlynkCoordinator, snapshot_store
+from .scheduler import BlynkPollScheduler
+from .services import async_setup_services
 from .const import (
     DOMAIN,
     CONF_TOKEN,
-    CONF_SCAN_INTERVAL,
-    DEFAULT_SCAN_INTERVAL,
-    MANUFACTURER,
-    VERSION,
+    CONNECTION_LIMIT_PER_HOST,
+    DNS_CACHE_TTL,
+    KEEPALIVE_TIMEOUT,
+    DATA_SESSION,
+    DATA_SCHEDULER,
     ATTRIBUTION,
 )
 
@@ -41,55 +43,53 @@ PLATFORMS: list[Platform] = [
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the Blynk component."""
     hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][DATA_SCHEDULER] = BlynkPollScheduler(hass)
+    async_setup_services(hass)
     return True
 
+def _async_get_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Return the connection pool shared by all Blynk config entries."""
+    session = hass.data[DOMAIN].get(DATA_SESSION)
+    if session is not None and not session.closed:
+        return session
+
+    # HA'nın önbelleğe alınmış SSL context'ini kullan, event loop'ta yeniden oluşturma
+    connector = aiohttp.TCPConnector(
+        ssl=ssl_util.get_default_context(),
+        limit_per_host=CONNECTION_LIMIT_PER_HOST,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    session = aiohttp.ClientSession(connector=connector)
+    hass.data[DOMAIN][DATA_SESSION] = session
+
+    async def _async_close_session(_event: Event) -> None:
+        """Close the pool when Home Assistant shuts down."""
+        if not session.closed:
+            await session.close()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_session)
+    return session
+
+async def _async_release_session(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Close the shared pool once the last config entry is unloaded."""
+    for other in hass.config_entries.async_entries(DOMAIN):
+        if other.entry_id != entry.entry_id and other.state is ConfigEntryState.LOADED:
+            return
+    session = hass.data[DOMAIN].pop(DATA_SESSION, None)
+    if session is not None and not session.closed:
+        await session.close()
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Blynk from a config entry."""
-    api = BlynkCloudAPI(entry.data[CONF_TOKEN])
-
-    # Koordinatör oluşturmadan önce bağlantıyı test edelim
-    try:
-        # İlk veri çekme denemesi
-        initial_data = await api.get_all_pins()
-        if not initial_data:
-            _LOGGER.error("No data received from Blynk API")
-            raise ConfigEntryNotReady("No data received from device")
-
-    except Exception as err:
-        _LOGGER.error("Error setting up Blynk integration: %s", str(err))
-        raise ConfigEntryNotReady from err
-
-    async def async_update_data() -> dict[str, Any]:
-        """Fetch data from API."""
-        try:
-            data = await api.get_all_pins()
-            _LOGGER.debug(
-                "Received data from Blynk device %s: %s",
-                entry.data[CONF_TOKEN][:8],
-                data,
-            )
-            if not data:
-                raise UpdateFailed("No data received")
-            return data
-        except Exception as err:
-            _LOGGER.error(
-                "Error communicating with Blynk API: %s",
-                str(err),
-            )
-            raise UpdateFailed(f"Error communicating with API: {err}")
-
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name=f"{DOMAIN}_{entry.data[CONF_TOKEN][:8]}",
-        update_method=async_update_data,
-        update_interval=timedelta(
-            seconds=entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-        ),
-    )
+    api = BlynkCloudAPI(entry.data[CONF_TOKEN], _async_get_session(hass))
+    scheduler: BlynkPollScheduler = hass.data[DOMAIN][DATA_SCHEDULER]
+    coordinator = BlynkCoordinator(hass, entry, api, scheduler)
+    await coordinator.async_select_server()
 
-    # İlk veriyi koordinatöre yükleyelim
-    coordinator.data = initial_data
+    # Saklanan veri yoksa ilk veri çekilir; başarısız olursa ConfigEntryNotReady
+    if not await coordinator.async_restore():
+        await coordinator.async_config_entry_first_refresh()
 
     hass.data[DOMAIN][entry.entry_id] = {
         "coordinator": coordinator,
@@ -97,51 +97,64 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    
-    # İlk güncellemeyi başlat
-    await coordinator.async_refresh()
+
+    # Sonraki yoklamaları (eski veriyle başlandıysa ilkini de) ortak zamanlayıcı dağıtır
+    entry.async_on_unload(scheduler.async_add(coordinator))
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     return True
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change."""
+    coordinator: BlynkCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    if coordinator.options != entry.options:
+        await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        await _async_release_session(hass, entry)
     return unload_ok
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the saved pin snapshot of a removed entry."""
+    await snapshot_store(hass, entry.data[CONF_TOKEN]).async_remove()
+
 class BlynkEntity(CoordinatorEntity):
     """Represents a Blynk entity."""
 
     _attr_has_entity_name = True
-    
+    _attr_attribution = ATTRIBUTION
+
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: BlynkCoordinator,
         pin: str,
         name: str,
     ) -> None:
         """Initialize the entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=pin)
         
-        self._pin = pin
+        # Anlık görüntü anahtarlarıyla aynı (intern edilmiş) string
+        self._pin = sys.intern(pin)
         self._attr_name = name
         self._attr_unique_id = f"{DOMAIN}_{pin}"
         
-        # Set device info
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, coordinator.name)},
-            "name": f"Blynk Device ({coordinator.name})",
-            "manufacturer": MANUFACTURER,
-            "model": "Cloud Device",
-            "sw_version": VERSION,
-        }
-        
-        self._attr_attribution = ATTRIBUTION
+        # Cihaz bilgisi koordinatördeki ortak nesne
+        self._attr_device_info = coordinator.device_info
 
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
         return (
-            self.coordinator.last_update_success
+            self.coordinator.available
             and self._pin in self.coordinator.data
         )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Flag values restored from storage until the first poll succeeds."""
+        if self.coordinator.stale:
+            return {"stale": True}
+        return None
@@ -1,8 +1,13 @@
 """Support for Blynk binary sensors."""
-from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 import logging
 
 from .const import (
@@ -12,6 +17,7 @@ from .const import (
     CONF_DEVICE_CLASS,
 )
 from . import BlynkEntity
+from .coordinator import BlynkCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,19 +34,37 @@ class BlynkBinarySensor(BlynkEntity, BinarySensorEntity):
     @property
     def is_on(self):
         """Return true if the binary sensor is on."""
-        if not self.coordinator.data or self._pin not in self.coordinator.data:
+        if not self.coordinator.data:
             return None
-        
-        value = self.coordinator.data[self._pin]
-        _LOGGER.debug("Binary sensor %s value: %s (type: %s)", self._pin, value, type(value))
-        
-        if isinstance(value, bool):
-            return value
-        if isinstance(value, (int, float)):
-            return bool(value)
-        if isinstance(value, str):
-            return value.lower() in ('true', '1', 'on', 'yes')
-        return False
+        return self.coordinator.data.get(self._pin)
+
+class BlynkConnectivitySensor(CoordinatorEntity[BlynkCoordinator], BinarySensorEntity):
+    """Whether the device's hardware is connected to Blynk Cloud.
+
+    Reports the connection check the coordinator makes before every poll;
+    unknown while the check fails.
+    """
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
+    _attr_translation_key = "hardware_connected"
+
+    def __init__(self, coordinator: BlynkCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{DOMAIN}_{coordinator.entry.entry_id}_hardware_connected"
+        self._attr_device_info = coordinator.device_info
+
+    @property
+    def available(self) -> bool:
+        """Stay available while the hardware is offline."""
+        return self.coordinator.hardware_connected is not None
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return True if the hardware is connected."""
+        return self.coordinator.hardware_connected
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -61,5 +85,7 @@ async def async_setup_entry(
                     pin_config,
                 )
             )
+
+    entities.append(BlynkConnectivitySensor(coordinator))
     
     async_add_entities(entities)
\ No newline at end of file
@@ -1,38 +1,523 @@
 """Blynk Cloud API implementation."""
+import asyncio
 import aiohttp
+import hashlib
+import json
 import logging
-from typing import Optional, Dict, Any
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from functools import partial
+from typing import Callable, Optional, Dict, Any, Iterable, List, Mapping, Tuple
+from urllib.parse import quote, urlsplit
 
-from .const import API_URL, DEFAULT_TIMEOUT
+from .const import (
+    API_URL,
+    API_REGIONS,
+    REGIONAL_API_URL,
+    SERVER_PROBE_TIMEOUT,
+    DEFAULT_TIMEOUT,
+    MAX_URL_LENGTH,
+    REQUEST_COST_IN_PINS,
+    WRITE_COALESCE_DELAY,
+    WRITE_RATE_WINDOW,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_BACKOFF_BASE,
+    DEFAULT_BACKOFF_MAX,
+    DEFAULT_READ_FRESHNESS,
+    MAX_RETRY_AFTER,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    CIRCUIT_MAX_RESET_TIMEOUT,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT)
+PROBE_TIMEOUT = aiohttp.ClientTimeout(total=SERVER_PROBE_TIMEOUT)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """Circuit breaker shared by all API clients talking to one host.
+
+    After CIRCUIT_FAILURE_THRESHOLD consecutive failures the circuit opens
+    and requests fail fast. Once the reset timeout has passed a single
+    probe request is let through; success closes the circuit, failure
+    opens it again with a doubled timeout.
+    """
+
+    def __init__(self, host: str) -> None:
+        """Initialize the breaker."""
+        self.host = host
+        self.state = CIRCUIT_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._reset_timeout = CIRCUIT_RESET_TIMEOUT
+        self._listeners: List[Callable[[], None]] = []
+
+    @property
+    def is_closed(self) -> bool:
+        """Return True while requests flow normally."""
+        return self.state == CIRCUIT_CLOSED
+
+    @property
+    def retry_at(self) -> Optional[float]:
+        """Return the monotonic time of the next probe while the circuit is open."""
+        if self.state == CIRCUIT_OPEN:
+            return self._opened_at + self._reset_timeout
+        return None
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call listener on every state change; return a function to remove it."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _set_state(self, state: str) -> None:
+        """Change state and notify listeners."""
+        if state == self.state:
+            return
+        self.state = state
+        for listener in list(self._listeners):
+            listener()
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent now."""
+        if self.state == CIRCUIT_CLOSED:
+            return True
+        if self.state == CIRCUIT_OPEN and time.monotonic() >= self.retry_at:
+            _LOGGER.debug("Probing Blynk cloud at %s", self.host)
+            self._set_state(CIRCUIT_HALF_OPEN)
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Record a request that reached the server."""
+        self._failures = 0
+        if self.state != CIRCUIT_CLOSED:
+            _LOGGER.info("Blynk cloud at %s is reachable again", self.host)
+            self._reset_timeout = CIRCUIT_RESET_TIMEOUT
+            self._set_state(CIRCUIT_CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a request that failed because the server was unreachable."""
+        self._failures += 1
+        if self.state == CIRCUIT_HALF_OPEN:
+            self._reset_timeout = min(self._reset_timeout * 2, CIRCUIT_MAX_RESET_TIMEOUT)
+        elif self.state == CIRCUIT_CLOSED and self._failures >= CIRCUIT_FAILURE_THRESHOLD:
+            _LOGGER.warning(
+                "Blynk cloud at %s is not responding, pausing requests for %d seconds",
+                self.host,
+                self._reset_timeout,
+            )
+        else:
+            return
+        self._opened_at = time.monotonic()
+        self._set_state(CIRCUIT_OPEN)
+
+    def abort_probe(self) -> None:
+        """Allow a new probe after a probe request was cancelled."""
+        if self.state == CIRCUIT_HALF_OPEN:
+            self._opened_at = time.monotonic() - self._reset_timeout
+            self._set_state(CIRCUIT_OPEN)
+
+_CIRCUIT_BREAKERS: Dict[str, CircuitBreaker] = {}
+
+
+class PinWriteStats:
+    """Write counters of one pin.
+
+    requested counts set_pin_value calls, sent the values that went out
+    and coalesced the values replaced by a newer one before being sent.
+    Rates are per minute over the last WRITE_RATE_WINDOW seconds.
+    """
+
+    __slots__ = ("requested", "sent", "coalesced", "failed", "_requested_at", "_sent_at")
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.requested = 0
+        self.sent = 0
+        self.coalesced = 0
+        self.failed = 0
+        self._requested_at: deque = deque()
+        self._sent_at: deque = deque()
+
+    @staticmethod
+    def _rate(times: deque) -> float:
+        """Drop timestamps outside the window and return the rate per minute."""
+        cutoff = time.monotonic() - WRITE_RATE_WINDOW
+        while times and times[0] < cutoff:
+            times.popleft()
+        return len(times) * 60 / WRITE_RATE_WINDOW
+
+    def record_request(self, coalesced: bool) -> None:
+        """Record a requested write."""
+        self.requested += 1
+        self.coalesced += coalesced
+        self._requested_at.append(time.monotonic())
+        self._rate(self._requested_at)
+
+    def record_sent(self, success: bool) -> None:
+        """Record a write that went out."""
+        self.sent += 1
+        self.failed += not success
+        self._sent_at.append(time.monotonic())
+        self._rate(self._sent_at)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters and rates."""
+        return {
+            "requested": self.requested,
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+            "requested_per_minute": self._rate(self._requested_at),
+            "sent_per_minute": self._rate(self._sent_at),
+        }
+
+def get_circuit_breaker(host: str) -> CircuitBreaker:
+    """Return the circuit breaker of a host."""
+    if host not in _CIRCUIT_BREAKERS:
+        _CIRCUIT_BREAKERS[host] = CircuitBreaker(host)
+    return _CIRCUIT_BREAKERS[host]
+
+def _retry_after(response: aiohttp.ClientResponse) -> Optional[float]:
+    """Return the delay requested by a Retry-After header, in seconds."""
+    header = response.headers.get("Retry-After")
+    if not header:
+        return None
+    try:
+        return max(float(header), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(header).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
 class BlynkCloudAPI:
     """Blynk Cloud API."""
     
-    def __init__(self, token: str):
-        """Initialize the API."""
+    def __init__(
+        self,
+        token: str,
+        session: aiohttp.ClientSession,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        read_freshness: float = DEFAULT_READ_FRESHNESS,
+    ):
+        """Initialize the API.
+
+        The session is owned by the caller and reused for every request, so
+        connections to the cloud stay pooled between polls and writes.
+        Reads are retried up to max_retries times with jittered exponential
+        backoff; writes are only retried after a rate limit response.
+        Concurrent identical reads share one request, whose result is
+        reused for read_freshness seconds.
+        """
         self.token = token
         self.base_url = API_URL
+        self._breaker_url: Optional[str] = None
+        self._breaker: Optional[CircuitBreaker] = None
+        self._session = session
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._rate_limited_until = 0.0
+        self.read_freshness = read_freshness
+        self._inflight_reads: Dict[str, asyncio.Task] = {}
+        self._fresh_reads: Dict[str, Tuple[float, Any]] = {}
+        self.reads_joined = 0
+        self.reads_reused = 0
+        self.request_hook: Optional[Callable[[str, Any, float, int], None]] = None
+        self._pending_writes: Dict[str, Any] = {}
+        self._pending_waiters: Dict[str, List[asyncio.Future]] = {}
+        self._inflight_pins: set = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.write_stats: Dict[str, PinWriteStats] = {}
+        self._write_tasks: set = set()
+        # getAll'dan öğrenilen cihazdaki toplam pin sayısı
+        self._device_pin_count: Optional[int] = None
+        # URL başına son yanıt gövdesinin parmak izi ve çözülmüş hali
+        self._body_cache: Dict[str, Tuple[bytes, Any]] = {}
+        self._result_cache: Dict[Tuple[str, ...], Tuple[List[Any], Dict[str, Any]]] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """Return the circuit breaker of the API host.
+
+        Looked up again only when base_url changes; every entity reads it
+        through the coordinator's availability.
+        """
+        if self._breaker_url != self.base_url:
+            self._breaker = get_circuit_breaker(urlsplit(self.base_url).netloc)
+            self._breaker_url = self.base_url
+        return self._breaker
+
+    def set_base_url(self, base_url: str) -> None:
+        """Send further requests to another server."""
+        if base_url.rstrip("/") != self.base_url:
+            self.base_url = base_url.rstrip("/")
+            self._invalidate_reads()
+
+    async def async_find_server(
+        self, candidates: Optional[Iterable[str]] = None
+    ) -> Optional[str]:
+        """Return the base URL of the fastest server that accepts the token.
+
+        Every candidate (the global host and the regional ones by default)
+        gets one isHardwareConnected request at the same time. A redirect
+        counts as an answer of the server it leads to. Returns None if no
+        server accepts the token, e.g. while offline.
+        """
+        if candidates is None:
+            candidates = [API_URL] + [
+                REGIONAL_API_URL.format(region=region) for region in API_REGIONS
+            ]
+
+        async def _async_probe(base_url: str) -> Optional[Tuple[float, str]]:
+            """Return the latency and final base URL of one candidate."""
+            start = time.perf_counter()
+            try:
+                async with self._session.get(
+                    f"{base_url}/isHardwareConnected?token={self.token}",
+                    timeout=PROBE_TIMEOUT,
+                ) as response:
+                    await response.read()
+                    if response.status != 200:
+                        return None
+                    # Yönlendirme varsa son sunucu asıl sunucudur
+                    origin = str(response.url.origin())
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                return None
+            return time.perf_counter() - start, origin + urlsplit(base_url).path
+
+        results = [
+            result
+            for result in await asyncio.gather(*map(_async_probe, candidates))
+            if result is not None
+        ]
+        if not results:
+            return None
+        latency, base_url = min(results)
+        _LOGGER.debug("Fastest Blynk server is %s (%.0f ms)", base_url, latency * 1000)
+        return base_url
+
+    def _backoff(self, attempt: int) -> float:
+        """Return a jittered exponential backoff delay for a retry attempt."""
+        delay = min(self._backoff_max, self._backoff_base * 2 ** attempt)
+        return delay * random.uniform(0.5, 1.5)
+
+    async def _make_request(self, endpoint: str, idempotent: bool = True) -> Optional[Any]:
+        """Make a request to the Blynk API, sharing identical reads.
+
+        An idempotent request for an endpoint that is already being fetched
+        awaits the request in flight instead of sending another one, and a
+        successful result is returned again for read_freshness seconds.
+        Writes drop both, so a read issued after a write reaches the server.
+        """
+        if not idempotent:
+            self._invalidate_reads()
+            try:
+                return await self._send_request(endpoint, idempotent)
+            finally:
+                self._invalidate_reads()
+
+        fresh = self._fresh_reads.get(endpoint)
+        if fresh is not None and time.monotonic() - fresh[0] < self.read_freshness:
+            self.reads_reused += 1
+            return fresh[1]
+        task = self._inflight_reads.get(endpoint)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._send_request(endpoint))
+            self._inflight_reads[endpoint] = task
+            task.add_done_callback(partial(self._read_done, endpoint))
+        else:
+            self.reads_joined += 1
+        # Bir çağıranın iptali ortak isteği iptal etmesin
+        return await asyncio.shield(task)
+
+    def _read_done(self, endpoint: str, task: asyncio.Task) -> None:
+        """Forget a finished shared read and keep its result while fresh."""
+        if self._inflight_reads.get(endpoint) is not task:
+            return
+        del self._inflight_reads[endpoint]
+        if task.cancelled() or task.exception() is not None or task.result() is None:
+            return
+        now = time.monotonic()
+        self._fresh_reads = {
+            key: fresh
+            for key, fresh in self._fresh_reads.items()
+            if now - fresh[0] < self.read_freshness
+        }
+        if self.read_freshness > 0:
+            self._fresh_reads[endpoint] = (now, task.result())
+
+    def _invalidate_reads(self) -> None:
+        """Stop sharing reads that may predate a write."""
+        self._inflight_reads.clear()
+        self._fresh_reads.clear()
+
+    def clear_read_cache(self) -> None:
+        """Forget shared reads and fingerprinted responses.
+
+        The next read of every endpoint reaches the server and its response
+        is decoded again, as on the first poll.
+        """
+        self._invalidate_reads()
+        self._body_cache.clear()
+        self._result_cache.clear()
 
-    async def _make_request(self, endpoint: str) -> Optional[Dict[str, Any]]:
-        """Make a request to the Blynk API."""
+    async def _send_request(self, endpoint: str, idempotent: bool = True) -> Optional[Any]:
+        """Send a request to the Blynk API.
+
+        Returns None if the request failed. Idempotent requests are retried
+        on connection errors and server errors; every request is retried
+        after HTTP 429, honouring Retry-After. request_hook, if set, is
+        called after every attempt with the endpoint name, the HTTP status
+        (or "timeout"/"connection_error"), the latency and the body size.
+
+        Successful idempotent responses are fingerprinted; a body identical
+        to the previous one for the same URL returns the previously decoded
+        object itself, so callers can detect it by identity.
+        """
         url = f"{self.base_url}/{endpoint}"
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=DEFAULT_TIMEOUT) as response:
-                    _LOGGER.debug("API request to %s, status: %s", url, response.status)
-                    if response.status == 200:
-                        try:
-                            return await response.json()
-                        except aiohttp.ContentTypeError:
-                            text = await response.text()
-                            return {"value": text}
-                    _LOGGER.error("API request failed: %s", response.status)
+        endpoint_name = endpoint.split("?", 1)[0]
+        breaker = self.circuit_breaker
+        for attempt in range(self._max_retries + 1):
+            wait = self._rate_limited_until - time.monotonic()
+            if wait > 0:
+                if wait > MAX_RETRY_AFTER:
+                    _LOGGER.debug("Rate limited by Blynk cloud, skipping request")
                     return None
-        except Exception as err:
-            _LOGGER.error("API request error: %s", str(err))
+                await asyncio.sleep(wait)
+            if not breaker.allow_request():
+                _LOGGER.debug("Circuit for %s is open, skipping request", breaker.host)
+                return None
+
+            retry = False
+            delay = self._backoff(attempt)
+            status: Any = "error"
+            size = 0
+            start = time.perf_counter()
+            try:
+                async with self._session.get(url, timeout=REQUEST_TIMEOUT) as response:
+                    status = response.status
+                    body = await response.read()
+                    size = len(body)
+                    _LOGGER.debug("API request to %s, status: %s", endpoint_name, status)
+                    if status == 200:
+                        breaker.record_success()
+                        if not idempotent:
+                            return self._decode_body(response, body)
+                        return self._decode_cached(url, response, body)
+                    if status == 429:
+                        # Sunucu ayakta, sadece istek hızımızı sınırlıyor
+                        breaker.record_success()
+                        delay = _retry_after(response) or delay
+                        self._rate_limited_until = time.monotonic() + delay
+                        retry = True
+                    elif status >= 500:
+                        breaker.record_failure()
+                        retry = idempotent
+                    else:
+                        breaker.record_success()
+                        _LOGGER.error("API request failed: %s", status)
+                        return None
+                    _LOGGER.debug("API request failed: %s", status)
+            except asyncio.CancelledError:
+                status = None
+                breaker.abort_probe()
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                status = "timeout" if isinstance(err, asyncio.TimeoutError) else "connection_error"
+                breaker.record_failure()
+                retry = idempotent
+                _LOGGER.debug("API request error: %s", str(err) or type(err).__name__)
+            except Exception as err:
+                _LOGGER.error("API request error: %s", str(err))
+                return None
+            finally:
+                if self.request_hook is not None and status is not None:
+                    self.request_hook(
+                        endpoint_name, status, time.perf_counter() - start, size
+                    )
+
+            if not retry or attempt == self._max_retries:
+                break
+            if self._rate_limited_until <= time.monotonic():
+                await asyncio.sleep(delay)
+        return None
+
+    def _decode_cached(
+        self, url: str, response: aiohttp.ClientResponse, body: bytes
+    ) -> Any:
+        """Decode a read response unless its body matches the previous one."""
+        fingerprint = hashlib.blake2b(body, digest_size=16).digest()
+        cached = self._body_cache.get(url)
+        if cached is not None and cached[0] == fingerprint:
+            self.cache_hits += 1
+            return cached[1]
+        self.cache_misses += 1
+        data = self._decode_body(response, body)
+        self._body_cache[url] = (fingerprint, data)
+        return data
+
+    def _cached_result(
+        self, key: Tuple[str, ...], responses: List[Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Return the result built last time from these very responses."""
+        cached = self._result_cache.get(key)
+        if cached is not None and len(cached[0]) == len(responses) and all(
+            old is new for old, new in zip(cached[0], responses)
+        ):
+            return cached[1]
+        return None
+
+    @staticmethod
+    def _decode_body(response: aiohttp.ClientResponse, body: bytes) -> Any:
+        """Decode a response body; non-JSON bodies become {"value": text}."""
+        text = body.decode(response.charset or "utf-8", errors="replace")
+        if response.content_type == "application/json" and text.strip():
+            try:
+                data = json.loads(text)
+            except ValueError:
+                pass
+            else:
+                return {"value": None} if data is None else data
+        # Boş gövde de başarılı bir yanıttır (ör. update)
+        return {"value": text}
+
+    @staticmethod
+    def _process_values(response: Mapping[str, Any]) -> Dict[str, Any]:
+        """Normalize the pin names of a pin response.
+
+        Values are passed through untouched; they are decoded once per
+        refresh by the coordinator according to each pin's type.
+        """
+        # Pin isimlerini standartlaştır
+        return {
+            pin.upper(): value for pin, value in response.items() if value is not None
+        }
+
+    async def is_hardware_connected(self) -> Optional[bool]:
+        """Return whether the device is connected to the cloud.
+
+        Returns None if the check failed.
+        """
+        response = await self._make_request(f"isHardwareConnected?token={self.token}")
+        if response is None:
             return None
+        if isinstance(response, dict):
+            response = response.get("value")
+        return str(response).strip().lower() == "true"
 
     async def get_all_pins(self) -> Dict[str, Any]:
         """Get all pins from the device."""
@@ -40,37 +525,179 @@ class BlynkCloudAPI:
         if not response:
             return {}
         
+        key = ("getAll",)
+        if (processed_data := self._cached_result(key, [response])) is not None:
+            return processed_data
+        self._device_pin_count = len(response)
+        processed_data = self._process_values(response)
+        self._result_cache[key] = ([response], processed_data)
+        _LOGGER.debug("Processed pin data: %s", processed_data)
+        return processed_data
+
+    async def get_pins(self, pins: Iterable[str]) -> Dict[str, Any]:
+        """Get the given pins from the device.
+
+        Pins are read with multi-pin get requests, sharded so that no URL
+        exceeds MAX_URL_LENGTH. getAll is used instead when it is estimated
+        to cost less than the shards.
+
+        When every response body is unchanged since the previous call for
+        the same pins, the previously returned dict is returned again, so
+        callers must treat it as read-only.
+        """
+        pins = list(dict.fromkeys(pin.upper() for pin in pins))
+        if not pins:
+            return {}
+        prefix = f"get?token={self.token}"
+        chunks = self._split_params(prefix, pins)
+
+        if self._device_pin_count is None:
+            # Cihaz boyutu bilinmiyorsa tek getAll birden fazla parçadan ucuzdur
+            use_get_all = len(chunks) > 1
+        else:
+            shard_cost = len(chunks) * REQUEST_COST_IN_PINS + len(pins)
+            get_all_cost = REQUEST_COST_IN_PINS + self._device_pin_count
+            use_get_all = get_all_cost <= shard_cost
+        key = tuple(pins)
+        if use_get_all:
+            data = await self.get_all_pins()
+            if (processed_data := self._cached_result(key, [data])) is None:
+                processed_data = {pin: data[pin] for pin in pins if pin in data}
+                self._result_cache[key] = ([data], processed_data)
+            return processed_data
+
+        responses = await asyncio.gather(
+            *(self._make_request(f"{prefix}&{'&'.join(chunk)}") for chunk in chunks)
+        )
+        if None not in responses and (
+            processed_data := self._cached_result(key, responses)
+        ) is not None:
+            return processed_data
         processed_data = {}
-        for pin, value in response.items():
-            if value is not None:
-                # Pin isimlerini standartlaştır
-                pin_name = pin.upper()
-                # Değerleri uygun formata çevir
-                try:
-                    # Önce float dönüşümünü dene
-                    processed_value = float(value)
-                    # Eğer tam sayıysa, int'e çevir
-                    if processed_value.is_integer():
-                        processed_value = int(processed_value)
-                except (ValueError, TypeError):
-                    # Sayısal değilse string olarak bırak
-                    processed_value = str(value)
-                
-                processed_data[pin_name] = processed_value
-        
+        for chunk, response in zip(chunks, responses):
+            if response is None:
+                continue
+            if len(chunk) == 1 and not (
+                isinstance(response, dict)
+                and chunk[0] in (key.upper() for key in response)
+            ):
+                # Tek pin istendiğinde Blynk değeri doğrudan döndürür
+                if isinstance(response, dict) and "value" in response:
+                    response = response["value"]
+                response = {chunk[0]: response}
+            processed_data.update(self._process_values(response))
+
+        if None not in responses:
+            self._result_cache[key] = (responses, processed_data)
         _LOGGER.debug("Processed pin data: %s", processed_data)
         return processed_data
 
-    async def set_pin_value(self, pin: str, value: Any) -> bool:
-        """Set pin value."""
-        # Pin ismini düzelt
-        pin = pin.upper()
-        # Değeri string'e çevir
-        str_value = str(value)
-        response = await self._make_request(f"update?token={self.token}&{pin}={str_value}")
-        success = response is not None
+    def _split_params(self, prefix: str, params: List[str]) -> List[List[str]]:
+        """Split query parameters so that no request URL exceeds MAX_URL_LENGTH."""
+        budget = MAX_URL_LENGTH - len(self.base_url) - len(prefix) - 1
+        chunks: List[List[str]] = []
+        current: List[str] = []
+        length = 0
+        for param in params:
+            # Her parametre için "&" ayracını da say
+            size = len(param) + 1
+            if current and length + size > budget:
+                chunks.append(current)
+                current, length = [], 0
+            current.append(param)
+            length += size
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def set_pins(self, values: Mapping[str, Any]) -> bool:
+        """Set several pins with one batch/update request per URL-sized chunk."""
+        if not values:
+            return True
+        prefix = f"batch/update?token={self.token}"
+        params = [
+            f"{pin.upper()}={quote(str(value), safe='')}"
+            for pin, value in values.items()
+        ]
+        chunks = self._split_params(prefix, params)
+        responses = await asyncio.gather(
+            *(
+                self._make_request(f"{prefix}&{'&'.join(chunk)}", idempotent=False)
+                for chunk in chunks
+            )
+        )
+        success = all(response is not None for response in responses)
         if success:
-            _LOGGER.debug("Successfully set pin %s to %s", pin, str_value)
+            _LOGGER.debug(
+                "Successfully set %d pins in %d request(s)", len(values), len(chunks)
+            )
         else:
-            _LOGGER.error("Failed to set pin %s to %s", pin, str_value)
-        return success
\ No newline at end of file
+            _LOGGER.error("Failed to set pins %s", ", ".join(values))
+        return success
+
+    async def set_pin_value(self, pin: str, value: Any) -> bool:
+        """Set pin value.
+
+        Each pin has at most one write in flight. Values written while the
+        pin is busy, or within WRITE_COALESCE_DELAY of each other, replace
+        the queued value, so intermediate values are skipped and the last
+        value written is the one that lands. Writes to different pins are
+        merged into a single set_pins call. The result is that of the
+        request that carried the pin's value (or the value replacing it).
+        """
+        loop = asyncio.get_running_loop()
+        pin = pin.upper()
+        stats = self.write_stats.setdefault(pin, PinWriteStats())
+        stats.record_request(pin in self._pending_writes)
+        self._pending_writes[pin] = value
+        waiter = loop.create_future()
+        self._pending_waiters.setdefault(pin, []).append(waiter)
+        self._schedule_flush()
+        return await waiter
+
+    def _schedule_flush(self) -> None:
+        """Start a flush if a queued pin has no write in flight."""
+        if self._flush_task is not None or self._pending_writes.keys() <= self._inflight_pins:
+            return
+        self._flush_task = asyncio.get_running_loop().create_task(self._async_flush_writes())
+        self._write_tasks.add(self._flush_task)
+        self._flush_task.add_done_callback(self._write_tasks.discard)
+
+    async def _async_flush_writes(self) -> None:
+        """Send the queued writes of the pins that have no write in flight."""
+        try:
+            await asyncio.sleep(WRITE_COALESCE_DELAY)
+        except asyncio.CancelledError:
+            self._flush_task = None
+            for waiters in self._pending_waiters.values():
+                for waiter in waiters:
+                    waiter.cancel()
+            self._pending_writes, self._pending_waiters = {}, {}
+            raise
+        self._flush_task = None
+        # Yazması süren pinler sırada bekler, yalnızca en son değerleri gider
+        values = {
+            pin: self._pending_writes.pop(pin)
+            for pin in list(self._pending_writes)
+            if pin not in self._inflight_pins
+        }
+        waiters = {pin: self._pending_waiters.pop(pin, []) for pin in values}
+        self._inflight_pins.update(values)
+        try:
+            success = await self.set_pins(values)
+        except asyncio.CancelledError:
+            for pin_waiters in waiters.values():
+                for waiter in pin_waiters:
+                    waiter.cancel()
+            raise
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.error("Error writing pins %s: %s", ", ".join(values), err)
+            success = False
+        finally:
+            self._inflight_pins.difference_update(values)
+        for pin, pin_waiters in waiters.items():
+            self.write_stats[pin].record_sent(success)
+            for waiter in pin_waiters:
+                if not waiter.done():
+                    waiter.set_result(success)
+        self._schedule_flush()
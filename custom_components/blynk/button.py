@@ -2,40 +2,107 @@
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 import logging
 import asyncio
+import contextlib
 
 from .const import (
     DOMAIN,
     PIN_TYPE_BUTTON,
     CONF_PIN_TYPE,
     CONF_PIN_NAME,
+    CONF_PULSE_WIDTH,
+    BUTTON_PULSE_WIDTH,
+    BUTTON_MIN_PULSE_WIDTH,
 )
 from . import BlynkEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 class BlynkButton(BlynkEntity, ButtonEntity):
-    """Representation of a Blynk button."""
+    """Representation of a Blynk button.
+
+    A press writes 1 and returns; once the 1 is written, a background task
+    of the config entry writes 0 after the pulse width. The release is
+    written even if the press fails or the task is cancelled, and pressing
+    again during a pulse extends it. A press that arrives while the release is being
+    written is released again after its own pulse. When the entity is
+    removed, e.g. on unload, a pending release is written right away.
+    """
 
     def __init__(self, coordinator, api, pin, config):
         """Initialize the button."""
         super().__init__(coordinator, pin, config[CONF_PIN_NAME])
         self._api = api
-        self._attr_name = config[CONF_PIN_NAME]
         self._attr_unique_id = f"{DOMAIN}_{pin}_button"
+        # Daha kısa darbelerde 0, kuyruktaki 1'in yerine geçerdi
+        self._pulse_width = max(
+            float(config.get(CONF_PULSE_WIDTH, BUTTON_PULSE_WIDTH)),
+            BUTTON_MIN_PULSE_WIDTH,
+        )
+        self._release_at = 0.0
+        self._release_task: asyncio.Task | None = None
+
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available.
+
+        Button pins are write-only and are not part of the polled data.
+        """
+        return self.coordinator.available
 
     async def async_press(self) -> None:
         """Handle the button press."""
         try:
-            await self._api.set_pin_value(self._pin, "1")
-            await asyncio.sleep(0.1)
-            await self._api.set_pin_value(self._pin, "0")
-            self.async_write_ha_state()
-            _LOGGER.debug("Button pressed successfully for pin %s", self._pin)
-        except Exception as err:
-            _LOGGER.error("Error pressing button: %s", err)
+            pressed = await self._api.set_pin_value(self._pin, 1)
+        finally:
+            # Darbe 1 yazıldıktan sonra başlar; basma başarısız ya da iptal olsa bile
+            self._schedule_release()
+        if not pressed:
+            raise HomeAssistantError(f"Failed to press button on pin {self._pin}")
+        self.coordinator.async_note_write()
+        _LOGGER.debug("Button pressed successfully for pin %s", self._pin)
+
+    def _schedule_release(self) -> None:
+        """Release the pin once the pulse width has passed."""
+        self._release_at = self.hass.loop.time() + self._pulse_width
+        if self._release_task is None or self._release_task.done():
+            self._release_task = self.coordinator.entry.async_create_background_task(
+                self.hass, self._async_release(), f"{DOMAIN} release {self._pin}"
+            )
+
+    async def _async_release(self) -> None:
+        """Wait for the end of the pulse, then write 0.
+
+        If a press moved the end of the pulse while 0 was being written,
+        its 1 may have landed after the 0; wait for the new end and write
+        0 again. On cancellation 0 is written without waiting.
+        """
+        try:
+            while True:
+                while (delay := self._release_at - self.hass.loop.time()) > 0:
+                    await asyncio.sleep(delay)
+                await asyncio.shield(self._async_write_release())
+                if self._release_at <= self.hass.loop.time():
+                    return
+        except asyncio.CancelledError:
+            await asyncio.shield(self._async_write_release())
+            raise
+
+    async def _async_write_release(self) -> None:
+        """Write 0 to the pin."""
+        if not await self._api.set_pin_value(self._pin, 0):
+            _LOGGER.error("Failed to release button on pin %s", self._pin)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Release a pressed pin before the entry closes the connection pool."""
+        await super().async_will_remove_from_hass()
+        if self._release_task is not None and not self._release_task.done():
+            self._release_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._release_task
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -1,9 +1,13 @@
 """Config flow for Blynk."""
+import math
+from urllib.parse import urlsplit
+
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
 import logging
 from homeassistant.helpers import selector
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import (
     DOMAIN,
@@ -13,7 +17,22 @@ from .const import (
     CONF_PIN_NAME,
     CONF_DEVICE_CLASS,
     CONF_UNIT,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_TELEMETRY,
+    CONF_PULSE_WIDTH,
+    CONF_POLL_GROUP,
+    CONF_POLL_GROUPS,
+    CONF_POLL_GROUP_PINS,
+    CONF_SERVER,
+    CONF_HOME_SERVER,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_TELEMETRY,
+    DEFAULT_POLL_GROUP,
     PIN_TYPE_OPTIONS,
     SENSOR_DEVICE_CLASSES,
     BINARY_SENSOR_DEVICE_CLASSES,
@@ -30,11 +49,52 @@ from .const import (
     INPUT_NUMBER_STEP,
     INPUT_TEXT_MIN_LENGTH,
     INPUT_TEXT_MAX_LENGTH,
+    BUTTON_PULSE_WIDTH,
+    BUTTON_MIN_PULSE_WIDTH,
+    BUTTON_MAX_PULSE_WIDTH,
+    DISCOVERY_PAGE_SIZE,
 )
 from .blynk_api import BlynkCloudAPI
+from .coordinator import snapshot_payload, snapshot_store
+from .discovery import async_sample_pins, filter_pins, propose_pin_configs
 
 _LOGGER = logging.getLogger(__name__)
 
+REVIEW_ACCEPT = "accept"
+REVIEW_NEXT = "next"
+REVIEW_PREVIOUS = "previous"
+
+
+def _valid_server(url):
+    """Return True if url looks like an http(s) base URL."""
+    parts = urlsplit(url)
+    return parts.scheme in ("http", "https") and bool(parts.netloc)
+
+
+def _scan_interval_selector():
+    """Return the number box used for update intervals."""
+    return selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=5,
+            max=1000000,
+            mode=selector.NumberSelectorMode.BOX
+        ),
+    )
+
+
+def _pin_type_selector():
+    """Return the dropdown used to pick a pin type."""
+    return selector.SelectSelector(
+        selector.SelectSelectorConfig(
+            options=[
+                selector.SelectOptionDict(value=value, label=label)
+                for value, label in PIN_TYPE_OPTIONS.items()
+            ],
+            mode=selector.SelectSelectorMode.DROPDOWN
+        ),
+    )
+
+
 class BlynkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Blynk."""
 
@@ -44,6 +104,8 @@ class BlynkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Initialize the config flow."""
         self._token = None
         self._scan_interval = DEFAULT_SCAN_INTERVAL
+        self._server = ""
+        self._home_server = None
         self._discovered_pins = []
         self._pin_values = {}
         self._pin_selection = []
@@ -51,6 +113,11 @@ class BlynkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._pin_configs = {}
         self._pin_config_order = []
         self._current_pin_index = 0
+        self._proposals = {}
+        self._selected = set()
+        self._customize = set()
+        self._review_filter = ""
+        self._review_page = 0
 
     async def async_step_user(self, user_input=None):
         """Step 1: Token and scan interval."""
@@ -58,8 +125,11 @@ class BlynkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             self._token = user_input[CONF_TOKEN].strip()
             self._scan_interval = user_input.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+            self._server = user_input.get(CONF_SERVER, "").strip()
             if len(self._token) < 10:
                 errors["base"] = "invalid_token_format"
+            elif self._server and not _valid_server(self._server):
+                errors[CONF_SERVER] = "invalid_server"
             else:
                 for entry in self._async_current_entries():
                     if entry.data.get(CONF_TOKEN) == self._token:
@@ -70,31 +140,41 @@ class BlynkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="user",
             data_schema=vol.Schema({
                 vol.Required(CONF_TOKEN): str,
-                vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): selector.NumberSelector(
-                    selector.NumberSelectorConfig(
-                        min=5,
-                        max=1000000,
-                        mode=selector.NumberSelectorMode.BOX
-                    ),
-                ),
+                vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): _scan_interval_selector(),
+                vol.Optional(CONF_SERVER, default=""): str,
             }),
             errors=errors,
         )
 
     async def async_step_connection(self, user_input=None):
-        """Step 2: Discover pins and go to selection."""
+        """Step 2: Discover pins and propose a configuration."""
         errors = {}
-        api = BlynkCloudAPI(self._token)
+        api = BlynkCloudAPI(self._token, async_get_clientsession(self.hass))
         try:
-            pins = await api.get_all_pins()
-            if pins:
-                self._discovered_pins = []
+            if self._server:
+                api.set_base_url(self._server)
+            else:
+                # Token'ın en hızlı sunucusu sonraki açılışlar için saklanır
+                self._home_server = await api.async_find_server()
+                if self._home_server:
+                    api.set_base_url(self._home_server)
+            # Tipleri tahmin edebilmek için değerleri birkaç kez oku
+            samples = await async_sample_pins(api)
+            if samples[0]:
+                self._proposals = propose_pin_configs(samples)
+                self._discovered_pins = list(self._proposals)
                 self._pin_values = {}
-                for pin, value in pins.items():
-                    pin_name = pin.upper()
-                    self._discovered_pins.append(pin_name)
-                    self._pin_values[pin_name] = value
-                return await self.async_step_pin_selection()
+                for sample in samples:
+                    self._pin_values.update(sample)
+                self._selected = set(self._discovered_pins)
+                self._customize = set()
+                self._review_filter = ""
+                self._review_page = 0
+                return self.async_show_menu(
+                    step_id="discovery",
+                    menu_options=["pin_review", "pin_selection"],
+                    description_placeholders={"pins": str(len(self._discovered_pins))},
+                )
             else:
                 errors["base"] = "no_pins_found"
         except Exception as err:
@@ -114,19 +194,7 @@ class BlynkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             pin_schema[vol.Optional(f"enable_{pin}", default=True)] = selector.BooleanSelector(
                 selector.BooleanSelectorConfig(),
             )
-            pin_schema[vol.Optional(f"type_{pin}", default="sensor")] = selector.SelectSelector(
-                selector.SelectSelectorConfig(
-                    options=[
-                        selector.SelectOptionDict(value="sensor", label="Sensor"),
-                        selector.SelectOptionDict(value="binary_sensor", label="Binary Sensor"),
-                        selector.SelectOptionDict(value="switch", label="Switch"),
-                        selector.SelectOptionDict(value="input_number", label="Input Number"),
-                        selector.SelectOptionDict(value="button", label="Button"),
-                        selector.SelectOptionDict(value="input_text", label="Text Input"),
-                    ],
-                    mode=selector.SelectSelectorMode.DROPDOWN
-                ),
-            )
+            pin_schema[vol.Optional(f"type_{pin}", default="sensor")] = _pin_type_selector()
 
         if user_input is not None:
             self._pin_selection = []
@@ -149,6 +217,145 @@ class BlynkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    def _review_pins(self):
+        """Return the pins matching the review filter."""
+        return filter_pins(
+            self._discovered_pins, self._proposals, self._pin_values, self._review_filter
+        )
+
+    async def async_step_pin_review(self, user_input=None):
+        """Step 3: Review the proposed configuration a page at a time.
+
+        Every discovered pin starts selected with its inferred type. Pins
+        ticked for customizing get their own type and detail forms; all
+        other selected pins are added as proposed.
+        """
+        errors = {}
+        matching = self._review_pins()
+        pages = max(1, math.ceil(len(matching) / DISCOVERY_PAGE_SIZE))
+        self._review_page = min(self._review_page, pages - 1)
+        start = self._review_page * DISCOVERY_PAGE_SIZE
+        page = matching[start:start + DISCOVERY_PAGE_SIZE]
+
+        if user_input is not None:
+            selected = set(user_input.get("pins", []))
+            customize = set(user_input.get("customize", []))
+            for pin in page:
+                if pin in selected:
+                    self._selected.add(pin)
+                else:
+                    self._selected.discard(pin)
+                if pin in customize:
+                    self._customize.add(pin)
+                else:
+                    self._customize.discard(pin)
+
+            review_filter = user_input.get("filter", "").strip()
+            action = user_input.get("action", REVIEW_ACCEPT)
+            if review_filter != self._review_filter:
+                # Filtre değişince ilk sayfaya dön
+                self._review_filter = review_filter
+                self._review_page = 0
+            elif action == REVIEW_NEXT:
+                self._review_page += 1
+            elif action == REVIEW_PREVIOUS:
+                self._review_page = max(0, self._review_page - 1)
+            elif not self._selected:
+                errors["base"] = "no_pins_selected"
+            else:
+                ordered = [pin for pin in self._discovered_pins if pin in self._selected]
+                self._pin_types = {
+                    pin: self._proposals[pin][CONF_PIN_TYPE] for pin in ordered
+                }
+                self._pin_configs = {
+                    pin: dict(self._proposals[pin])
+                    for pin in ordered
+                    if pin not in self._customize
+                }
+                self._pin_config_order = [pin for pin in ordered if pin in self._customize]
+                if self._pin_config_order:
+                    return await self.async_step_pin_types()
+                self._current_pin_index = 0
+                return await self.async_step_pin_config()
+            if not errors:
+                return await self.async_step_pin_review()
+
+        options = [
+            selector.SelectOptionDict(
+                value=pin,
+                label=(
+                    f"{pin} · {PIN_TYPE_OPTIONS[self._proposals[pin][CONF_PIN_TYPE]]}"
+                    f" · {str(self._pin_values.get(pin, ''))[:24]}"
+                ),
+            )
+            for pin in page
+        ]
+        actions = [REVIEW_ACCEPT]
+        if self._review_page + 1 < pages:
+            actions.append(REVIEW_NEXT)
+        if self._review_page > 0:
+            actions.append(REVIEW_PREVIOUS)
+
+        return self.async_show_form(
+            step_id="pin_review",
+            data_schema=vol.Schema({
+                vol.Optional("filter", default=self._review_filter): str,
+                vol.Optional(
+                    "pins", default=[pin for pin in page if pin in self._selected]
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=options,
+                        multiple=True,
+                        mode=selector.SelectSelectorMode.LIST,
+                    ),
+                ),
+                vol.Optional(
+                    "customize", default=[pin for pin in page if pin in self._customize]
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=[
+                            selector.SelectOptionDict(value=pin, label=pin) for pin in page
+                        ],
+                        multiple=True,
+                        mode=selector.SelectSelectorMode.DROPDOWN,
+                    ),
+                ),
+                vol.Optional(
+                    "action", default=REVIEW_ACCEPT
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=actions,
+                        mode=selector.SelectSelectorMode.LIST,
+                        translation_key="review_action",
+                    ),
+                ),
+            }),
+            errors=errors,
+            description_placeholders={
+                "page": str(self._review_page + 1),
+                "pages": str(pages),
+                "matching": str(len(matching)),
+                "selected": str(len(self._selected)),
+                "total": str(len(self._discovered_pins)),
+            },
+        )
+
+    async def async_step_pin_types(self, user_input=None):
+        """Step 4: Choose the types of the pins to customize."""
+        if user_input is not None:
+            for pin in self._pin_config_order:
+                self._pin_types[pin] = user_input.get(f"type_{pin}", self._pin_types[pin])
+            self._current_pin_index = 0
+            return await self.async_step_pin_config()
+
+        return self.async_show_form(
+            step_id="pin_types",
+            data_schema=vol.Schema({
+                vol.Optional(f"type_{pin}", default=self._pin_types[pin]): _pin_type_selector()
+                for pin in self._pin_config_order
+            }),
+        )
+
     async def async_step_pin_config(self, user_input=None):
         """Step 4+: Configure each selected pin in turn (name, class/unit)."""
         errors = {}
@@ -162,6 +369,8 @@ class BlynkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 conf[CONF_DEVICE_CLASS] = user_input[CONF_DEVICE_CLASS]
             if CONF_UNIT in user_input:
                 conf[CONF_UNIT] = user_input[CONF_UNIT]
+            if poll_group := user_input.get(CONF_POLL_GROUP, "").strip():
+                conf[CONF_POLL_GROUP] = poll_group
             
             # Yeni tip için ek konfigürasyonları kaydet
             if self._pin_types[prev_pin] == PIN_TYPE_INPUT_NUMBER:
@@ -177,16 +386,30 @@ class BlynkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     "max_length": user_input.get("max_length", INPUT_TEXT_MAX_LENGTH),
                     "pattern": user_input.get("pattern"),
                 })
+            elif self._pin_types[prev_pin] == PIN_TYPE_BUTTON:
+                conf[CONF_PULSE_WIDTH] = user_input.get(
+                    CONF_PULSE_WIDTH, BUTTON_PULSE_WIDTH
+                )
             
             self._pin_configs[prev_pin] = conf
 
         if self._current_pin_index >= len(self._pin_config_order):
+            # Keşifte okunan değerler ilk açılışta yeniden çekilmesin
+            await snapshot_store(self.hass, self._token).async_save(
+                snapshot_payload(self._pin_values)
+            )
             return self.async_create_entry(
                 title=f"Blynk Device ({self._token[:8]}...)",
                 data={
                     CONF_TOKEN: self._token,
                     CONF_SCAN_INTERVAL: self._scan_interval,
-                    "pins": self._pin_configs,
+                    CONF_SERVER: self._server,
+                    CONF_HOME_SERVER: self._home_server,
+                    "pins": {
+                        pin: self._pin_configs[pin]
+                        for pin in self._discovered_pins
+                        if pin in self._pin_configs
+                    },
                 }
             )
 
@@ -277,6 +500,20 @@ class BlynkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 ),
                 vol.Optional("pattern"): str,
             })
+        elif pin_type == PIN_TYPE_BUTTON:
+            schema[vol.Optional(CONF_PULSE_WIDTH, default=BUTTON_PULSE_WIDTH)] = selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=BUTTON_MIN_PULSE_WIDTH,
+                    max=BUTTON_MAX_PULSE_WIDTH,
+                    step=0.05,
+                    unit_of_measurement="s",
+                    mode=selector.NumberSelectorMode.BOX,
+                ),
+            )
+
+        if pin_type != PIN_TYPE_BUTTON:
+            # Boş bırakılırsa pin cihazın güncelleme aralığıyla okunur
+            schema[vol.Optional(CONF_POLL_GROUP, default="")] = str
 
         self._current_pin_index += 1
 
@@ -293,11 +530,48 @@ class BlynkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return BlynkOptionsFlowHandler(config_entry)
 
 
+def _parse_poll_groups(text: str) -> dict[str, float]:
+    """Parse "name=seconds" pairs separated by commas.
+
+    Raises ValueError if a pair is malformed or an interval is not a
+    positive, finite number.
+    """
+    groups = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        name, separator, seconds = item.partition("=")
+        interval = float(seconds)
+        if (
+            not separator
+            or not name.strip()
+            or not math.isfinite(interval)
+            or interval <= 0
+        ):
+            raise ValueError(item)
+        groups[name.strip()] = interval
+    return groups
+
+
+def _format_poll_groups(groups: dict[str, float]) -> str:
+    """Return poll groups in the form accepted by _parse_poll_groups."""
+    return ", ".join(f"{name}={interval:g}" for name, interval in groups.items())
+
+
 class BlynkOptionsFlowHandler(config_entries.OptionsFlow):
-    """Handle Blynk options."""
+    """Handle Blynk options.
+
+    When poll groups exist, a second step assigns the device's pins to
+    them; the assignment is stored in the options and overrides the group
+    chosen for a pin at setup.
+    """
 
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         """Initialize options flow."""
+        self._pins_config = config_entry.data.get("pins", {})
+        self._read_pins = [
+            pin
+            for pin, pin_config in self._pins_config.items()
+            if pin_config.get(CONF_PIN_TYPE) != PIN_TYPE_BUTTON
+        ]
         self.options = dict(config_entry.options)
         if not self.options:
             self.options = {
@@ -305,17 +579,37 @@ class BlynkOptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
                 )
             }
+        self.options.setdefault(CONF_SERVER, config_entry.data.get(CONF_SERVER, ""))
 
     async def async_step_init(self, user_input=None):
         """Manage the options."""
+        errors = {}
         if user_input is not None:
-            return self.async_create_entry(
-                title="",
-                data={
-                    CONF_SCAN_INTERVAL: user_input[CONF_SCAN_INTERVAL]
-                }
-            )
+            try:
+                poll_groups = _parse_poll_groups(user_input.get(CONF_POLL_GROUPS, ""))
+            except ValueError:
+                errors["base"] = "invalid_poll_groups"
+            if user_input[CONF_MIN_SCAN_INTERVAL] > user_input[CONF_MAX_SCAN_INTERVAL]:
+                errors["base"] = "invalid_interval_range"
+            server = user_input.get(CONF_SERVER, "").strip()
+            if server and not _valid_server(server):
+                errors[CONF_SERVER] = "invalid_server"
+            if not errors:
+                self.options.update({
+                    CONF_SCAN_INTERVAL: user_input[CONF_SCAN_INTERVAL],
+                    CONF_ADAPTIVE_POLLING: user_input[CONF_ADAPTIVE_POLLING],
+                    CONF_MIN_SCAN_INTERVAL: user_input[CONF_MIN_SCAN_INTERVAL],
+                    CONF_MAX_SCAN_INTERVAL: user_input[CONF_MAX_SCAN_INTERVAL],
+                    CONF_TELEMETRY: user_input[CONF_TELEMETRY],
+                    CONF_POLL_GROUPS: poll_groups,
+                    CONF_SERVER: server,
+                })
+                if self._group_names() and self._read_pins:
+                    return await self.async_step_poll_group_pins()
+                self.options[CONF_POLL_GROUP_PINS] = {}
+                return self.async_create_entry(title="", data=self.options)
 
+        interval_selector = _scan_interval_selector()
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema({
@@ -324,12 +618,98 @@ class BlynkOptionsFlowHandler(config_entries.OptionsFlow):
                     default=self.options.get(
                         CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
                     )
-                ): selector.NumberSelector(
-                    selector.NumberSelectorConfig(
-                        min=5,
-                        max=1000000,
-                        mode=selector.NumberSelectorMode.BOX
+                ): interval_selector,
+                vol.Required(
+                    CONF_ADAPTIVE_POLLING,
+                    default=self.options.get(
+                        CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+                    )
+                ): selector.BooleanSelector(),
+                vol.Required(
+                    CONF_MIN_SCAN_INTERVAL,
+                    default=self.options.get(
+                        CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+                    )
+                ): interval_selector,
+                vol.Required(
+                    CONF_MAX_SCAN_INTERVAL,
+                    default=self.options.get(
+                        CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+                    )
+                ): interval_selector,
+                vol.Required(
+                    CONF_TELEMETRY,
+                    default=self.options.get(CONF_TELEMETRY, DEFAULT_TELEMETRY)
+                ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_POLL_GROUPS,
+                    default=_format_poll_groups(self.options.get(CONF_POLL_GROUPS, {}))
+                ): str,
+                vol.Optional(CONF_SERVER, default=self.options[CONF_SERVER]): str,
+            }),
+            errors=errors,
+        )
+
+    def _pin_group(self, pin):
+        """Return the poll group a pin is currently assigned to."""
+        return (
+            self.options.get(CONF_POLL_GROUP_PINS, {}).get(
+                pin, self._pins_config[pin].get(CONF_POLL_GROUP)
+            )
+            or DEFAULT_POLL_GROUP
+        )
+
+    def _group_names(self):
+        """Return the defined poll groups and those pins are assigned to."""
+        names = dict.fromkeys(self.options.get(CONF_POLL_GROUPS, {}))
+        names.update(dict.fromkeys(self._pin_group(pin) for pin in self._read_pins))
+        names.pop(DEFAULT_POLL_GROUP, None)
+        return list(names)
+
+    async def async_step_poll_group_pins(self, user_input=None):
+        """Assign pins to poll groups; unassigned pins use the device interval."""
+        errors = {}
+        groups = self._group_names()
+        if user_input is not None:
+            assigned = {}
+            for group in groups:
+                for pin in user_input.get(group, []):
+                    if assigned.setdefault(pin, group) != group:
+                        errors["base"] = "pin_in_several_groups"
+            if not errors:
+                # Her okunan pin için açık atama; kurulumda seçilen grubu geçersiz kılar
+                self.options[CONF_POLL_GROUP_PINS] = {
+                    pin: assigned.get(pin, "") for pin in self._read_pins
+                }
+                return self.async_create_entry(title="", data=self.options)
+
+        pin_options = [
+            selector.SelectOptionDict(
+                value=pin,
+                label=f"{pin} · {self._pins_config[pin].get(CONF_PIN_NAME, pin)}",
+            )
+            for pin in self._read_pins
+        ]
+        return self.async_show_form(
+            step_id="poll_group_pins",
+            data_schema=vol.Schema({
+                vol.Optional(
+                    group,
+                    default=[
+                        pin for pin in self._read_pins if self._pin_group(pin) == group
+                    ],
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=pin_options,
+                        multiple=True,
+                        mode=selector.SelectSelectorMode.DROPDOWN,
                     ),
-                ),
-            })
+                )
+                for group in groups
+            }),
+            errors=errors,
+            description_placeholders={
+                "groups": _format_poll_groups(self.options.get(CONF_POLL_GROUPS, {}))
+                or "-",
+            },
         )
@@ -23,14 +23,82 @@ CONF_PIN_TYPE: Final = "pin_type"
 CONF_PIN_NAME: Final = "pin_name"
 CONF_DEVICE_CLASS: Final = "device_class"
 CONF_UNIT: Final = "unit"
+CONF_ADAPTIVE_POLLING: Final = "adaptive_polling"
+CONF_MIN_SCAN_INTERVAL: Final = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL: Final = "max_scan_interval"
+CONF_TELEMETRY: Final = "telemetry"
+CONF_PULSE_WIDTH: Final = "pulse_width"
+CONF_POLL_GROUP: Final = "poll_group"
+CONF_POLL_GROUPS: Final = "poll_groups"
+CONF_POLL_GROUP_PINS: Final = "poll_group_pins"
+CONF_SERVER: Final = "server"
+CONF_HOME_SERVER: Final = "home_server"
 
 # Defaults
 DEFAULT_SCAN_INTERVAL: Final = 120
 DEFAULT_TIMEOUT: Final = 10
+DEFAULT_ADAPTIVE_POLLING: Final = False
+DEFAULT_MIN_SCAN_INTERVAL: Final = 10
+DEFAULT_MAX_SCAN_INTERVAL: Final = 900
+DEFAULT_TELEMETRY: Final = False
+TELEMETRY_SAMPLES: Final = 100
+
+# Retry and circuit breaker
+DEFAULT_MAX_RETRIES: Final = 2
+DEFAULT_BACKOFF_BASE: Final = 0.5  # seconds
+DEFAULT_BACKOFF_MAX: Final = 10  # seconds
+MAX_RETRY_AFTER: Final = 60  # seconds
+CIRCUIT_FAILURE_THRESHOLD: Final = 5
+CIRCUIT_RESET_TIMEOUT: Final = 30  # seconds
+CIRCUIT_MAX_RESET_TIMEOUT: Final = 600  # seconds
+
+# Connection pool
+CONNECTION_LIMIT_PER_HOST: Final = 10
+DNS_CACHE_TTL: Final = 300
+KEEPALIVE_TIMEOUT: Final = 60
 
 # API
 API_URL: Final = "https://blynk.cloud/external/api"
+# Regional servers probed for the token's fastest valid host
+API_REGIONS: Final = ("fra1", "lon1", "ny3", "sgp1", "blr1", "sfo3")
+REGIONAL_API_URL: Final = "https://{region}.blynk.cloud/external/api"
+SERVER_PROBE_TIMEOUT: Final = 5  # seconds
+# Consecutive failed polls before the servers are probed again
+SERVER_REPROBE_FAILURES: Final = 3
+# Connection checks of offline hardware back off up to this interval
+OFFLINE_MAX_CHECK_INTERVAL: Final = 600  # seconds
 API_HEADERS: Final = {"Content-Type": "application/json"}
+MAX_URL_LENGTH: Final = 2000
+WRITE_COALESCE_DELAY: Final = 0.01  # seconds
+WRITE_RATE_WINDOW: Final = 60  # seconds
+DEFAULT_READ_FRESHNESS: Final = 1.0  # seconds
+# Per-request overhead expressed in pin values, used to choose between
+# multi-pin get requests and a single getAll
+REQUEST_COST_IN_PINS: Final = 20
+
+# Persisted pin snapshots
+STORAGE_VERSION: Final = 1
+SNAPSHOT_SAVE_DELAY: Final = 60  # seconds
+
+# In-memory pin history
+HISTORY_MAX_BYTES: Final = 64 * 1024  # per device
+SERVICE_GET_HISTORY: Final = "get_history"
+
+# Bulk writes across devices
+SERVICE_SET_PINS: Final = "set_pins"
+SET_PINS_MAX_CONCURRENT: Final = 8
+
+# hass.data[DOMAIN] keys shared by all config entries
+DATA_SESSION: Final = "session"
+DATA_SCHEDULER: Final = "scheduler"
+
+# Poll scheduler
+MAX_CONCURRENT_POLLS: Final = 4
+POLL_JITTER: Final = 0.1  # fraction of a slot
+POLL_RATE_WINDOW: Final = 600  # seconds
+# Pins without a poll group are polled at the device's scan interval
+DEFAULT_POLL_GROUP: Final = "default"
+POLL_GROUP_MIN_TICK: Final = 5  # seconds
 
 # Pin Types
 PIN_TYPE_SENSOR: Final = "sensor"
@@ -94,6 +162,17 @@ INPUT_NUMBER_STEP: Final = 1
 INPUT_TEXT_MIN_LENGTH: Final = 0
 INPUT_TEXT_MAX_LENGTH: Final = 100
 
+# Button Configuration
+BUTTON_PULSE_WIDTH: Final = 0.1  # seconds
+# Longer than WRITE_COALESCE_DELAY, so the release never replaces the press
+BUTTON_MIN_PULSE_WIDTH: Final = 0.05  # seconds
+BUTTON_MAX_PULSE_WIDTH: Final = 60  # seconds
+
+# Discovery
+DISCOVERY_SAMPLES: Final = 3
+DISCOVERY_SAMPLE_INTERVAL: Final = 2  # seconds
+DISCOVERY_PAGE_SIZE: Final = 25
+
 # Integration Metadata
 ATTRIBUTION: Final = "Data provided by Blynk Cloud"
 INTEGRATION_CREATED: Final = "2025-07-01"
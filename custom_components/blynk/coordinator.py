@@ -0,0 +1,661 @@
+"""Data update coordinator for Blynk devices."""
+from __future__ import annotations
+
+import logging
+import math
+import time
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from functools import partial
+from types import MappingProxyType
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import (
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
+from homeassistant.util import dt as dt_util
+
+from .blynk_api import BlynkCloudAPI
+from .const import (
+    DOMAIN,
+    CONF_TOKEN,
+    CONF_SCAN_INTERVAL,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_POLL_GROUP,
+    CONF_POLL_GROUPS,
+    CONF_POLL_GROUP_PINS,
+    CONF_SERVER,
+    CONF_HOME_SERVER,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_POLL_GROUP,
+    POLL_GROUP_MIN_TICK,
+    PIN_TYPE_BUTTON,
+    OFFLINE_MAX_CHECK_INTERVAL,
+    SERVER_REPROBE_FAILURES,
+    STORAGE_VERSION,
+    SNAPSHOT_SAVE_DELAY,
+    MANUFACTURER,
+    VERSION,
+)
+from .decoders import build_decoders, decode_snapshot
+from .history import DeviceHistory
+from .scheduler import BlynkPollScheduler
+from .telemetry import BlynkTelemetry
+
+_LOGGER = logging.getLogger(__name__)
+
+_MISSING = object()
+
+def device_name(token: str) -> str:
+    """Return the coordinator name of the device with the given token."""
+    return f"{DOMAIN}_{token[:8]}"
+
+
+def snapshot_store(hass: HomeAssistant, token: str) -> Store[dict[str, Any]]:
+    """Return the store holding the last raw pin values of a device."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{device_name(token)}")
+
+
+def snapshot_payload(pins: Mapping[str, Any]) -> dict[str, Any]:
+    """Return the stored form of a device's raw pin values."""
+    return {"saved_at": dt_util.utcnow().isoformat(), "pins": dict(pins)}
+
+
+class AdaptiveInterval:
+    """Poll interval that speeds up on activity and backs off while idle.
+
+    With adaptive polling disabled the interval stays at its base value.
+    """
+
+    def __init__(
+        self, base: float, minimum: float, maximum: float, adaptive: bool
+    ) -> None:
+        """Initialize the interval."""
+        self.base = base
+        self.minimum = min(minimum, base)
+        self.maximum = max(maximum, base)
+        self.adaptive = adaptive
+        self.current = base
+
+    def activity(self) -> None:
+        """Drop to the minimum interval after a write or a value change."""
+        if self.adaptive:
+            self.current = self.minimum
+
+    def idle(self) -> None:
+        """Double the interval after a poll that returned identical data."""
+        if self.adaptive:
+            self.current = min(self.current * 2, self.maximum)
+
+
+class PollGroup:
+    """Pins of one device that are polled together at their own interval."""
+
+    __slots__ = ("name", "pins", "interval", "next_due")
+
+    def __init__(self, name: str, interval: AdaptiveInterval) -> None:
+        """Initialize an empty group that is due at once."""
+        self.name = name
+        self.pins: list[str] = []
+        self.interval = interval
+        self.next_due = 0.0
+
+
+class BlynkCoordinator(DataUpdateCoordinator[Mapping[str, Any]]):
+    """Fetch the pin values of one Blynk device.
+
+    The coordinator has no timer of its own; polls are driven by the
+    domain-wide BlynkPollScheduler. Its data is an immutable snapshot of
+    pin values, decoded once per refresh according to each pin's type.
+
+    Pins are split into poll groups, each with its own (optionally
+    adaptive) interval. The scheduler ticks the coordinator at the
+    greatest common divisor of the group intervals, and every tick reads
+    the pins of all groups that are due with a single multi-pin request.
+    Other refreshes, e.g. from homeassistant.update_entity, read all pins.
+
+    Only the pins read by a poll are replaced in the snapshot; a pin that
+    was read but is missing from the response, because its value is empty
+    or its request failed, is dropped and its entity becomes unavailable.
+
+    Listeners are indexed by their context, which for pin entities is the
+    pin name. After a refresh only the listeners of pins whose value
+    changed are called; listeners without a context and all listeners on
+    an availability change are always called. A poll whose response is
+    unchanged returns the previous snapshot object, which notifies only
+    the listeners without a context.
+
+    Writes from entities go through async_write_pin, which shows the new
+    value at once, confirms it with a read of that pin and rolls it back
+    on failure. Until then polls keep showing the pending value.
+
+    The last raw pin values are saved to a Store and restored on startup
+    without a fetch. A restored snapshot older than the poll interval is
+    marked stale until the first poll, which then runs in the background
+    right away. Every poll also adds the numeric pin values to a compact
+    in-memory history.
+
+    Every poll first asks the cloud whether the hardware is connected.
+    While it is not, the pins are not fetched and the checks back off up
+    to OFFLINE_MAX_CHECK_INTERVAL; once it reconnects all pins are read
+    right away.
+
+    The device is unavailable while the last refresh failed, the API
+    host's circuit is not closed or the hardware is offline.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        api: BlynkCloudAPI,
+        scheduler: BlynkPollScheduler,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=device_name(entry.data[CONF_TOKEN]),
+        )
+        self.api = api
+        self.entry = entry
+        self._scheduler = scheduler
+        self.options = dict(entry.options)
+        self.telemetry = BlynkTelemetry()
+        api.request_hook = self.telemetry.record_request
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, self.name)},
+            name=f"Blynk Device ({self.name})",
+            manufacturer=MANUFACTURER,
+            model="Cloud Device",
+            sw_version=VERSION,
+        )
+        self.pin_configs: Mapping[str, Mapping[str, Any]] = entry.data.get("pins", {})
+        self._decoders = build_decoders(self.pin_configs)
+        self._pin_listeners: dict[Any, list[CALLBACK_TYPE]] = {}
+        self._notified_data: Mapping[str, Any] | None = None
+        self._notified_available = True
+        # Okunan pin kümesi başına son ham yanıt, birleşik ham değerler
+        # ve bunlardan çözülen anlık görüntü
+        self._raw_by_pins: dict[tuple[str, ...], Mapping[str, Any]] = {}
+        self._raw_values: dict[str, Any] = {}
+        self._last_snapshot: Mapping[str, Any] | None = None
+        # Saklanan veriyle başlandıysa ilk başarılı yoklamaya kadar True
+        self.stale = False
+        self._notified_stale = False
+        self._store = snapshot_store(hass, entry.data[CONF_TOKEN])
+        # Onaylanmamış yazmalar: pin -> (sıra numarası, ham değer)
+        self._pending_writes: dict[str, tuple[int, Any]] = {}
+        self._write_sequence = 0
+        self._due_only = False
+        self._failed_polls = 0
+        self._reprobe_at = SERVER_REPROBE_FAILURES
+        # None: bilinmiyor (kontrol başarısız ya da henüz yapılmadı)
+        self.hardware_connected: bool | None = None
+        self._offline_interval = 0.0
+        self._remove_circuit_listener = api.circuit_breaker.add_listener(
+            self._handle_circuit_change
+        )
+        entry.async_on_unload(lambda: self._remove_circuit_listener())
+        # Butonlar sadece yazılır; okunacak pinler bunlar dışındakiler
+        self.read_pins = [
+            pin
+            for pin, pin_config in self.pin_configs.items()
+            if pin_config.get("pin_type") != PIN_TYPE_BUTTON
+        ]
+        self.groups = self._build_groups(self.pin_configs)
+        self._pin_groups = {
+            pin: group for group in self.groups.values() for pin in group.pins
+        }
+        self.history = DeviceHistory(self.read_pins)
+
+    def _option(self, key: str, default: Any) -> Any:
+        """Return an option, falling back to the value stored at setup."""
+        return self.options.get(key, self.entry.data.get(key, default))
+
+    def _build_groups(
+        self, pins_config: Mapping[str, Mapping[str, Any]]
+    ) -> dict[str, PollGroup]:
+        """Split the read pins into poll groups with their own intervals.
+
+        A pin's group set in the options wins over the one chosen at setup.
+        """
+        group_intervals = self._option(CONF_POLL_GROUPS, {})
+        group_pins = self.options.get(CONF_POLL_GROUP_PINS, {})
+        scan_interval = float(self._option(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL))
+        minimum = float(self._option(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL))
+        maximum = float(self._option(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL))
+        adaptive = self._option(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING)
+
+        groups: dict[str, PollGroup] = {}
+        for pin in self.read_pins:
+            name = (
+                group_pins.get(pin, pins_config[pin].get(CONF_POLL_GROUP))
+                or DEFAULT_POLL_GROUP
+            )
+            if name not in groups:
+                # Tanımsız (ya da geçersiz aralıklı) grup cihazın aralığını kullanır
+                base = float(group_intervals.get(name, scan_interval))
+                if not math.isfinite(base) or base <= 0:
+                    base = scan_interval
+                groups[name] = PollGroup(
+                    name, AdaptiveInterval(base, minimum, maximum, adaptive)
+                )
+            groups[name].pins.append(pin)
+        return groups
+
+    @property
+    def custom_server(self) -> str:
+        """Return the base URL set in the options or at setup, or ""."""
+        return self.entry.options.get(CONF_SERVER, self.entry.data.get(CONF_SERVER, ""))
+
+    async def async_select_server(self, probe: bool = False) -> None:
+        """Point the API at the server to use for this token.
+
+        A custom server from the options always wins. Otherwise the home
+        server cached in the entry is used, and the servers are probed
+        only when there is none or probe is set; a newly found server is
+        cached. Without an answer the current server is kept.
+        """
+        if custom := self.custom_server:
+            self._async_use_server(custom)
+            return
+        home = self.entry.data.get(CONF_HOME_SERVER)
+        if home and not probe:
+            self._async_use_server(home)
+            return
+        if (found := await self.api.async_find_server()) is None:
+            if home:
+                self._async_use_server(home)
+            return
+        self._async_use_server(found)
+        if found != home:
+            _LOGGER.info("Using Blynk server %s for %s", found, self.name)
+            self.hass.config_entries.async_update_entry(
+                self.entry, data={**self.entry.data, CONF_HOME_SERVER: found}
+            )
+
+    @callback
+    def _async_use_server(self, base_url: str) -> None:
+        """Send requests to base_url and follow the circuit of that host."""
+        if base_url.rstrip("/") == self.api.base_url:
+            return
+        self._remove_circuit_listener()
+        self.api.set_base_url(base_url)
+        self._remove_circuit_listener = self.api.circuit_breaker.add_listener(
+            self._handle_circuit_change
+        )
+        self._handle_circuit_change()
+
+    @callback
+    def _async_poll_failed(self) -> None:
+        """Probe the servers again after a run of failed polls.
+
+        Probes happen after SERVER_REPROBE_FAILURES failures and then after
+        twice as many each time, until a poll succeeds.
+        """
+        self._failed_polls += 1
+        if self._failed_polls < self._reprobe_at or self.custom_server:
+            return
+        self._reprobe_at *= 2
+        self.entry.async_create_background_task(
+            self.hass,
+            self.async_select_server(probe=True),
+            f"{DOMAIN} probe servers {self.name}",
+        )
+
+    async def _async_check_hardware(self) -> bool | None:
+        """Check whether the hardware is online; None if the check failed.
+
+        Each check that finds it offline doubles the time to the next one,
+        starting at the regular poll interval.
+        """
+        connected = await self.api.is_hardware_connected()
+        if connected is None:
+            return None
+        if connected and self.hardware_connected is False:
+            _LOGGER.info("Blynk device %s is online again", self.name)
+        elif not connected and self.hardware_connected is not False:
+            _LOGGER.info("Blynk device %s is offline", self.name)
+            self._offline_interval = self.poll_interval
+        elif not connected:
+            self._offline_interval = min(
+                self._offline_interval * 2, OFFLINE_MAX_CHECK_INTERVAL
+            )
+        self.hardware_connected = connected
+        return connected
+
+    async def async_restore(self) -> bool:
+        """Load the saved snapshot; return False without one.
+
+        A snapshot older than the poll interval is marked stale, which makes
+        the scheduler poll right away instead of at the coordinator's phase.
+        """
+        if not self.read_pins:
+            return False
+        stored = await self._store.async_load()
+        if not stored or not (pins := stored.get("pins")):
+            return False
+        self._raw_values = {pin: pins[pin] for pin in self.read_pins if pin in pins}
+        self.data = self._last_snapshot = decode_snapshot(
+            self._decoders, self._raw_values
+        )
+        saved_at = dt_util.parse_datetime(stored.get("saved_at") or "")
+        self.stale = (
+            saved_at is None
+            or (dt_util.utcnow() - saved_at).total_seconds() > self.poll_interval
+        )
+        return True
+
+    @callback
+    def _data_to_store(self) -> dict[str, Any]:
+        """Return the raw pin values to persist."""
+        return snapshot_payload(self._raw_values)
+
+    @property
+    def available(self) -> bool:
+        """Return True if the device data can be trusted."""
+        return (
+            self.last_update_success
+            and self.api.circuit_breaker.is_closed
+            and self.hardware_connected is not False
+        )
+
+    @callback
+    def _handle_circuit_change(self) -> None:
+        """Update entity availability when the cloud circuit opens or closes."""
+        if self.available != self._notified_available:
+            self.async_update_listeners()
+
+    @property
+    def poll_interval(self) -> float:
+        """Return the current number of seconds between scheduler ticks.
+
+        This is the greatest common divisor of the group intervals, but not
+        below POLL_GROUP_MIN_TICK unless a group polls even faster. While
+        the hardware is offline, the backed-off check interval if longer.
+        """
+        intervals = [group.interval.current for group in self.groups.values()]
+        if not intervals:
+            return float(self._option(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL))
+        tick = math.gcd(*(max(round(interval), 1) for interval in intervals))
+        tick = max(tick, min(min(intervals), POLL_GROUP_MIN_TICK))
+        if self.hardware_connected is False:
+            return float(max(tick, self._offline_interval))
+        return float(tick)
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates of one pin, or of all pins without context."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        self._pin_listeners.setdefault(context, []).append(update_callback)
+
+        @callback
+        def remove_pin_listener() -> None:
+            """Remove the listener from the pin index."""
+            remove_listener()
+            callbacks = self._pin_listeners[context]
+            callbacks.remove(update_callback)
+            if not callbacks:
+                del self._pin_listeners[context]
+
+        return remove_pin_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only the listeners whose pin value or availability changed."""
+        previous = self._notified_data
+        current = self._notified_data = self.data
+        if (
+            self.available != self._notified_available
+            or self.stale != self._notified_stale
+            or previous is None
+            or current is None
+        ):
+            self._notified_available = self.available
+            self._notified_stale = self.stale
+            super().async_update_listeners()
+            return
+
+        if current is previous:
+            for update_callback in list(self._pin_listeners.get(None, ())):
+                update_callback()
+            return
+
+        for context, callbacks in list(self._pin_listeners.items()):
+            if context is not None and previous.get(context, _MISSING) == current.get(
+                context, _MISSING
+            ):
+                continue
+            for update_callback in list(callbacks):
+                update_callback()
+
+    @callback
+    def async_set_pin_values(self, values: Mapping[str, Any]) -> None:
+        """Apply raw pin values that are known without polling."""
+        if self.data is None:
+            return
+        self.async_set_updated_data(
+            decode_snapshot(self._decoders, values, base=self.data)
+        )
+
+    async def async_write_pin(self, pin: str, value: Any) -> None:
+        """Write a pin optimistically and confirm it by reading it back.
+
+        Raises HomeAssistantError after restoring the previous value if the
+        write or the confirmation read fails. A write superseded by a newer
+        write to the same pin returns without confirming; the newer write
+        owns the outcome.
+        """
+        await self._async_write({pin: value}, partial(self.api.set_pin_value, pin, value))
+
+    async def async_write_pins(self, values: Mapping[str, Any]) -> None:
+        """Write several pins with one batch request, like async_write_pin."""
+        await self._async_write(values, partial(self.api.set_pins, values))
+
+    async def _async_write(
+        self, values: Mapping[str, Any], send: Callable[[], Awaitable[bool]]
+    ) -> None:
+        """Apply values optimistically, send them and confirm with one read."""
+        data = self.data if self.data is not None else {}
+        sequences: dict[str, int] = {}
+        previous: dict[str, Any] = {}
+        for pin, value in values.items():
+            self._write_sequence += 1
+            sequences[pin] = self._write_sequence
+            previous[pin] = data.get(pin, _MISSING)
+            self._pending_writes[pin] = (self._write_sequence, value)
+        self.async_set_pin_values(values)
+        for pin in values:
+            self.async_note_write(pin)
+
+        def latest_pins() -> list[str]:
+            """Return the pins not written again since."""
+            return [
+                pin
+                for pin, sequence in sequences.items()
+                if self._pending_writes.get(pin, (None,))[0] == sequence
+            ]
+
+        def release() -> list[str]:
+            """Drop the pending writes this call still owns and return their pins."""
+            latest = latest_pins()
+            for pin in latest:
+                del self._pending_writes[pin]
+            return latest
+
+        def restore(pins: list[str]) -> None:
+            """Show the values the pins had before this write."""
+            if not pins or self.data is None:
+                return
+            data = dict(self.data)
+            for pin in pins:
+                if previous[pin] is _MISSING:
+                    data.pop(pin, None)
+                else:
+                    data[pin] = previous[pin]
+            self.async_set_updated_data(MappingProxyType(data))
+
+        confirmed: Mapping[str, Any] = {}
+        try:
+            written = await send()
+            if written and (latest := latest_pins()):
+                confirmed = await self.api.get_pins(latest)
+        except BaseException:
+            # Zaman aşımı, açık devre kesici ya da iptalde de eski değer döner
+            restore(release())
+            raise
+        if not (latest := release()):
+            return
+        if all(pin.upper() in confirmed for pin in latest):
+            # Cihazın kabul ettiği değer gösterilir
+            self.async_set_pin_values({pin: confirmed[pin.upper()] for pin in latest})
+            return
+
+        restore(latest)
+        raise HomeAssistantError(
+            f"Failed to write {', '.join(f'{pin}={value!r}' for pin, value in values.items())}"
+            f" to {self.name}"
+        )
+
+    @callback
+    def async_note_write(self, pin: str | None = None) -> None:
+        """Poll the pin's group (all groups without a pin) sooner after a write."""
+        now = self.hass.loop.time()
+        groups: Iterable[PollGroup] = self.groups.values()
+        if pin in self._pin_groups:
+            groups = (self._pin_groups[pin],)
+        for group in groups:
+            group.interval.activity()
+            group.next_due = min(group.next_due, now + group.interval.current)
+        self._scheduler.async_reschedule(self)
+
+    async def async_scheduled_refresh(self) -> None:
+        """Refresh the poll groups that are due; called by the scheduler."""
+        self._due_only = True
+        try:
+            await self.async_refresh()
+        finally:
+            self._due_only = False
+
+    async def _async_update_data(self) -> Mapping[str, Any]:
+        """Fetch the pins of the poll groups that are due."""
+        if not self.read_pins:
+            return decode_snapshot(self._decoders, {})
+        now = self.hass.loop.time()
+        due = list(self.groups.values())
+        if self._due_only:
+            # Yarım adım içinde sırası gelen gruplar aynı istekte okunur
+            horizon = now + self.poll_interval / 2
+            due = [group for group in due if group.next_due <= horizon]
+            if not due and self.data is not None:
+                return self.data
+
+        was_connected = self.hardware_connected
+        async with self._scheduler.limiter:
+            connected = await self._async_check_hardware()
+        if connected is False:
+            # Çevrimdışı cihazın eski değerleri okunmaz
+            if self.data is not None:
+                return self.data
+            return decode_snapshot(self._decoders, {})
+        if connected and was_connected is False:
+            # Yeniden bağlanan cihazın tüm pinleri hemen okunur
+            due = list(self.groups.values())
+        pins = [pin for group in due for pin in group.pins]
+
+        async with self._scheduler.limiter:
+            start = time.perf_counter()
+            try:
+                data = await self.api.get_pins(pins)
+            except Exception as err:
+                self.telemetry.record_poll(time.perf_counter() - start, False)
+                self._async_poll_failed()
+                _LOGGER.error(
+                    "Error communicating with Blynk API: %s",
+                    str(err),
+                )
+                raise UpdateFailed(f"Error communicating with API: {err}") from err
+            self.telemetry.record_poll(time.perf_counter() - start, bool(data))
+        _LOGGER.debug(
+            "Received data from Blynk device %s: %s",
+            self.entry.data[CONF_TOKEN][:8],
+            data,
+        )
+        if not data:
+            self._async_poll_failed()
+            if retry_at := self.api.circuit_breaker.retry_at:
+                raise UpdateFailed(
+                    "Blynk cloud is unreachable, next attempt in "
+                    f"{max(retry_at - time.monotonic(), 0):.0f} seconds"
+                )
+            raise UpdateFailed("No data received")
+
+        key = tuple(pins)
+        if data is self._raw_by_pins.get(key) and self._last_snapshot is not None:
+            # Yanıt değişmedi; çözümleme ve bildirim yapılmaz
+            snapshot = self._last_snapshot
+        else:
+            self._raw_by_pins[key] = data
+            # Okunan ama yanıtta olmayan pinler (boş değer ya da başarısız
+            # parça) eski değerini korumaz, kullanılamaz olur
+            read = {pin.upper() for pin in pins}
+            for pin in read.difference(data):
+                self._raw_values.pop(pin, None)
+            self._raw_values.update(data)
+            base = None
+            if self._last_snapshot is not None:
+                base = {
+                    pin: value
+                    for pin, value in self._last_snapshot.items()
+                    if pin not in read
+                }
+            snapshot = self._last_snapshot = decode_snapshot(
+                self._decoders, data, base=base
+            )
+            self._store.async_delay_save(self._data_to_store, SNAPSHOT_SAVE_DELAY)
+        self.stale = False
+        self._failed_polls = 0
+        self._reprobe_at = SERVER_REPROBE_FAILURES
+        self.history.record(
+            time.time(), {pin: snapshot[pin] for pin in pins if pin in snapshot}
+        )
+
+        previous = self.data
+        for group in due:
+            if previous is not None:
+                if snapshot is not previous and any(
+                    snapshot.get(pin, _MISSING) != previous.get(pin, _MISSING)
+                    for pin in group.pins
+                ):
+                    group.interval.activity()
+                else:
+                    group.interval.idle()
+            group.next_due = now + group.interval.current
+            _LOGGER.debug(
+                "Next poll of %s group %s in %.0f seconds",
+                self.name,
+                group.name,
+                group.interval.current,
+            )
+
+        if self._pending_writes:
+            # Bekleyen yazmaların değerini eski bulut verisi ezmesin
+            snapshot = decode_snapshot(
+                self._decoders,
+                {pin: value for pin, (_, value) in self._pending_writes.items()},
+                base=snapshot,
+            )
+        return snapshot
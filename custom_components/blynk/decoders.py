@@ -0,0 +1,113 @@
+"""Pin value decoders for Blynk datastreams."""
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+import sys
+from types import MappingProxyType
+from typing import Any
+
+from .const import (
+    CONF_PIN_TYPE,
+    PIN_TYPE_SENSOR,
+    PIN_TYPE_BINARY_SENSOR,
+    PIN_TYPE_SWITCH,
+    PIN_TYPE_INPUT_NUMBER,
+    PIN_TYPE_INPUT_TEXT,
+)
+
+PinDecoder = Callable[[Any], Any]
+
+_TRUE_STRINGS = frozenset(("true", "on", "yes"))
+
+
+def decode_number(value: Any) -> int | float | str | None:
+    """Decode a numeric value, accepting comma decimals and thousand separators.
+
+    Values that cannot be parsed are returned as stripped strings.
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return value
+    text = str(value).strip()
+    if not text:
+        return None
+    number_text = text
+    if "," in number_text:
+        if "." not in number_text:
+            # Virgülü noktaya çevir (Türkçe format)
+            number_text = number_text.replace(",", ".")
+        elif "," in number_text[: number_text.rfind(".")]:
+            # Son noktadan önceki virgüller binlik ayracıdır (örn: 1,234.56)
+            number_text = number_text.replace(",", "")
+    try:
+        number = float(number_text)
+    except ValueError:
+        return text
+    return int(number) if number.is_integer() else number
+
+
+def decode_float(value: Any) -> float | None:
+    """Decode a value for a number entity, or None if it is not numeric."""
+    number = decode_number(value)
+    if isinstance(number, (int, float)):
+        return float(number)
+    return None
+
+
+def decode_bool(value: Any) -> bool | None:
+    """Decode an on/off value."""
+    if value is None:
+        return None
+    if isinstance(value, (bool, int, float)):
+        return bool(value)
+    text = str(value).strip().lower()
+    try:
+        return bool(float(text))
+    except ValueError:
+        return text in _TRUE_STRINGS
+
+
+def decode_text(value: Any) -> str | None:
+    """Decode a text value."""
+    return None if value is None else str(value)
+
+
+PIN_TYPE_DECODERS: dict[str, PinDecoder] = {
+    PIN_TYPE_SENSOR: decode_number,
+    PIN_TYPE_BINARY_SENSOR: decode_bool,
+    PIN_TYPE_SWITCH: decode_bool,
+    PIN_TYPE_INPUT_NUMBER: decode_float,
+    PIN_TYPE_INPUT_TEXT: decode_text,
+}
+
+
+def build_decoders(pins_config: Mapping[str, Mapping[str, Any]]) -> dict[str, PinDecoder]:
+    """Return the decoder of every configured pin, keyed by interned pin name."""
+    return {
+        sys.intern(pin.upper()): PIN_TYPE_DECODERS.get(
+            pin_config.get(CONF_PIN_TYPE), decode_text
+        )
+        for pin, pin_config in pins_config.items()
+    }
+
+
+def decode_snapshot(
+    decoders: Mapping[str, PinDecoder],
+    values: Mapping[str, Any],
+    base: Mapping[str, Any] | None = None,
+) -> Mapping[str, Any]:
+    """Decode raw pin values into an immutable snapshot.
+
+    Values are laid over base, so a partial read keeps the other pins.
+    """
+    snapshot = dict(base) if base else {}
+    for pin, value in values.items():
+        decoder = decoders.get(pin)
+        if decoder is None:
+            snapshot[sys.intern(pin)] = value
+        else:
+            snapshot[sys.intern(pin)] = decoder(value)
+    return MappingProxyType(snapshot)
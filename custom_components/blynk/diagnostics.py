@@ -0,0 +1,41 @@
+"""Diagnostics support for Blynk."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_TOKEN, DATA_SCHEDULER
+
+TO_REDACT = {CONF_TOKEN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    scheduler = hass.data[DOMAIN][DATA_SCHEDULER].as_dict()
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "available": coordinator.available,
+        "hardware_connected": coordinator.hardware_connected,
+        "stale": coordinator.stale,
+        "poll_interval": coordinator.poll_interval,
+        "data": dict(coordinator.data or {}),
+        "telemetry": coordinator.telemetry.as_dict(),
+        "reads": {
+            "joined": coordinator.api.reads_joined,
+            "reused": coordinator.api.reads_reused,
+        },
+        "writes": {
+            pin: stats.as_dict() for pin, stats in coordinator.api.write_stats.items()
+        },
+        "history": coordinator.history.as_dict(),
+        "scheduler": scheduler,
+    }
@@ -0,0 +1,97 @@
+"""Propose pin configurations from sampled pin values."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+from .blynk_api import BlynkCloudAPI
+from .const import (
+    CONF_PIN_NAME,
+    CONF_PIN_TYPE,
+    DISCOVERY_SAMPLES,
+    DISCOVERY_SAMPLE_INTERVAL,
+    INPUT_TEXT_MAX_LENGTH,
+    PIN_TYPE_BINARY_SENSOR,
+    PIN_TYPE_INPUT_TEXT,
+    PIN_TYPE_SENSOR,
+    PIN_TYPE_SWITCH,
+)
+from .decoders import decode_number
+
+_BOOL_STRINGS = frozenset(("true", "false", "on", "off", "yes", "no"))
+
+
+async def async_sample_pins(
+    api: BlynkCloudAPI,
+    count: int = DISCOVERY_SAMPLES,
+    interval: float = DISCOVERY_SAMPLE_INTERVAL,
+) -> list[dict[str, Any]]:
+    """Read all pins of the device count times, interval seconds apart.
+
+    Sampling stops early if the device reports no pins.
+    """
+    samples = [await api.get_all_pins()]
+    for _ in range(count - 1):
+        if not samples[0]:
+            break
+        await asyncio.sleep(interval)
+        samples.append(await api.get_all_pins())
+    return samples
+
+
+def infer_pin_type(values: Iterable[Any]) -> str:
+    """Return the pin type suggested by the values a pin reported.
+
+    Pins that only report 0 and 1 are binary sensors when the value changed
+    while sampling (the hardware drives them) and switches otherwise.
+    Other numbers are sensors and strings text inputs; strings too long
+    for a text entity and multi-value pins become sensors.
+    """
+    values = [value for value in values if value is not None and value != ""]
+    if not values or any(isinstance(value, (list, tuple)) for value in values):
+        return PIN_TYPE_SENSOR
+    numbers = {decode_number(value) for value in values}
+    if all(isinstance(number, (int, float)) for number in numbers):
+        if numbers <= {0, 1}:
+            return PIN_TYPE_BINARY_SENSOR if len(numbers) > 1 else PIN_TYPE_SWITCH
+        return PIN_TYPE_SENSOR
+    texts = {str(value).strip().lower() for value in values}
+    if texts <= _BOOL_STRINGS:
+        return PIN_TYPE_BINARY_SENSOR
+    if max(len(text) for text in texts) > INPUT_TEXT_MAX_LENGTH:
+        return PIN_TYPE_SENSOR
+    return PIN_TYPE_INPUT_TEXT
+
+
+def propose_pin_configs(
+    samples: Sequence[Mapping[str, Any]]
+) -> dict[str, dict[str, Any]]:
+    """Return a pin configuration for every pin seen in the samples."""
+    values: dict[str, list[Any]] = {}
+    for sample in samples:
+        for pin, value in sample.items():
+            values.setdefault(pin, []).append(value)
+    return {
+        pin: {CONF_PIN_TYPE: infer_pin_type(pin_values), CONF_PIN_NAME: pin}
+        for pin, pin_values in values.items()
+    }
+
+
+def filter_pins(
+    pins: Iterable[str],
+    configs: Mapping[str, Mapping[str, Any]],
+    values: Mapping[str, Any],
+    text: str,
+) -> list[str]:
+    """Return the pins whose name, proposed type or value contains text."""
+    needle = text.strip().lower()
+    if not needle:
+        return list(pins)
+    return [
+        pin
+        for pin in pins
+        if needle in pin.lower()
+        or needle in configs[pin][CONF_PIN_TYPE]
+        or needle in str(values.get(pin, "")).lower()
+    ]
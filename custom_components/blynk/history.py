@@ -0,0 +1,196 @@
+"""Compact in-memory history of numeric pin values."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+import math
+from typing import Any
+
+from .const import HISTORY_MAX_BYTES
+
+RESOLUTION_RAW = "raw"
+RESOLUTION_1M = "1m"
+RESOLUTION_15M = "15m"
+
+# Özetlenen katmanlar: çözünürlük -> kova süresi (saniye)
+TIER_SECONDS: dict[str, int] = {RESOLUTION_1M: 60, RESOLUTION_15M: 900}
+RESOLUTIONS = (RESOLUTION_RAW, *TIER_SECONDS)
+
+# Bellek payı: ham örnekler yarısını, her özet katmanı dörtte birini alır
+_BUDGET_SHARE = {RESOLUTION_RAW: 0.5, RESOLUTION_1M: 0.25, RESOLUTION_15M: 0.25}
+_FIELDS = {RESOLUTION_RAW: 2, RESOLUTION_1M: 4, RESOLUTION_15M: 4}
+_ITEM_SIZE = array("d").itemsize
+
+
+def _as_float(value: Any) -> float | None:
+    """Return a decoded pin value as a float, or None if it is not numeric."""
+    if isinstance(value, (bool, int, float)):
+        number = float(value)
+        return number if math.isfinite(number) else None
+    return None
+
+
+class _Ring:
+    """Fixed-capacity ring buffer of float rows, one array per column."""
+
+    __slots__ = ("columns", "capacity", "size", "_next")
+
+    def __init__(self, fields: int, capacity: int) -> None:
+        """Preallocate the columns."""
+        self.columns = [array("d", bytes(_ITEM_SIZE * capacity)) for _ in range(fields)]
+        self.capacity = capacity
+        self.size = 0
+        self._next = 0
+
+    def append(self, *row: float) -> None:
+        """Store a row, overwriting the oldest one when full."""
+        for column, value in zip(self.columns, row):
+            column[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def rows(self, since: float = -math.inf) -> Iterator[tuple[float, ...]]:
+        """Yield rows in time order whose first column is at or after since."""
+        start = (self._next - self.size) % self.capacity
+        for offset in range(self.size):
+            index = (start + offset) % self.capacity
+            if self.columns[0][index] >= since:
+                yield tuple(column[index] for column in self.columns)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory held by the columns."""
+        return sum(len(column) * column.itemsize for column in self.columns)
+
+
+class _Tier:
+    """Downsampled min/mean/max buckets of one pin at one resolution."""
+
+    __slots__ = ("seconds", "ring", "_start", "_min", "_max", "_sum", "_count")
+
+    def __init__(self, seconds: int, capacity: int) -> None:
+        """Initialize an empty tier."""
+        self.seconds = seconds
+        self.ring = _Ring(4, capacity)
+        self._start = -math.inf
+        self._min = self._max = self._sum = 0.0
+        self._count = 0
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample to the current bucket, closing it if it has passed."""
+        start = timestamp - timestamp % self.seconds
+        if start != self._start:
+            self._flush()
+            self._start = start
+            self._min = self._max = value
+            self._sum = 0.0
+            self._count = 0
+        self._min = min(self._min, value)
+        self._max = max(self._max, value)
+        self._sum += value
+        self._count += 1
+
+    def _flush(self) -> None:
+        """Move the current bucket into the ring."""
+        if self._count:
+            self.ring.append(
+                self._start, self._min, self._sum / self._count, self._max
+            )
+
+    def rows(self, since: float) -> Iterator[tuple[float, ...]]:
+        """Yield closed buckets, then the open one."""
+        yield from self.ring.rows(since)
+        if self._count and self._start >= since:
+            yield self._start, self._min, self._sum / self._count, self._max
+
+
+class PinHistory:
+    """Raw samples and downsampled tiers of one pin."""
+
+    __slots__ = ("raw", "tiers")
+
+    def __init__(self, capacities: Mapping[str, int]) -> None:
+        """Allocate the buffers with the given number of rows per resolution."""
+        self.raw = _Ring(2, capacities[RESOLUTION_RAW])
+        self.tiers = {
+            resolution: _Tier(seconds, capacities[resolution])
+            for resolution, seconds in TIER_SECONDS.items()
+        }
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Record one sample."""
+        self.raw.append(timestamp, value)
+        for tier in self.tiers.values():
+            tier.add(timestamp, value)
+
+    def rows(self, resolution: str, since: float) -> Iterator[tuple[float, ...]]:
+        """Yield (time, value) or (time, min, mean, max) rows."""
+        if resolution == RESOLUTION_RAW:
+            return self.raw.rows(since)
+        return self.tiers[resolution].rows(since)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory held by the buffers."""
+        return self.raw.nbytes + sum(tier.ring.nbytes for tier in self.tiers.values())
+
+
+class DeviceHistory:
+    """History of the numeric pins of one device within a fixed memory cap.
+
+    Every pin gets an equal share of max_bytes, split between the raw
+    samples and the 1-minute and 15-minute tiers. Buffers are allocated
+    when a pin first reports a numeric value; non-numeric values are not
+    recorded.
+    """
+
+    def __init__(self, pins: Iterable[str], max_bytes: int = HISTORY_MAX_BYTES) -> None:
+        """Initialize the history for the given pins."""
+        self.pins = list(pins)
+        per_pin = max_bytes / max(len(self.pins), 1)
+        self.capacities = {
+            resolution: max(
+                1, int(per_pin * share / (_FIELDS[resolution] * _ITEM_SIZE))
+            )
+            for resolution, share in _BUDGET_SHARE.items()
+        }
+        self._pins: dict[str, PinHistory] = {}
+
+    def record(self, timestamp: float, values: Mapping[str, Any]) -> None:
+        """Record the numeric values of a snapshot."""
+        for pin in self.pins:
+            if (value := _as_float(values.get(pin))) is None:
+                continue
+            if (history := self._pins.get(pin)) is None:
+                history = self._pins[pin] = PinHistory(self.capacities)
+            history.add(timestamp, value)
+
+    def query(
+        self, pin: str, resolution: str = RESOLUTION_RAW, since: float = -math.inf
+    ) -> list[tuple[float, ...]]:
+        """Return the rows of a pin since a UNIX timestamp."""
+        if (history := self._pins.get(pin)) is None:
+            return []
+        return list(history.rows(resolution, since))
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory held by all buffers."""
+        return sum(history.nbytes for history in self._pins.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary with 15-minute sparklines for diagnostics."""
+        return {
+            "memory_bytes": self.nbytes,
+            "capacities": self.capacities,
+            "pins": {
+                pin: {
+                    "samples": history.raw.size,
+                    "sparkline": [
+                        round(row[2], 3)
+                        for row in history.rows(RESOLUTION_15M, -math.inf)
+                    ],
+                }
+                for pin, history in self._pins.items()
+            },
+        }
@@ -0,0 +1,158 @@
+"""Fleet-wide poll scheduler for Blynk coordinators."""
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict, deque
+from functools import partial
+import logging
+import math
+import random
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import MAX_CONCURRENT_POLLS, POLL_JITTER, POLL_RATE_WINDOW
+
+if TYPE_CHECKING:
+    from .coordinator import BlynkCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BlynkPollScheduler:
+    """Spread the polls of all Blynk coordinators evenly over their interval.
+
+    Every coordinator gets a phase within its poll interval. Coordinators
+    sharing an interval are placed in equal slots (plus a little jitter),
+    so a fleet of devices polls at a steady rate instead of all at once.
+    The limiter caps how many fetches run at the same time. Coordinators
+    starting from a restored, stale snapshot are polled once right away.
+    The planned and measured poll rates are reported in the diagnostics of
+    every entry.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, max_concurrent: int = MAX_CONCURRENT_POLLS
+    ) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.max_concurrent = max_concurrent
+        self.limiter = asyncio.Semaphore(max_concurrent)
+        self._epoch = hass.loop.time()
+        self._phases: dict[BlynkCoordinator, float] = {}
+        self._timers: dict[BlynkCoordinator, asyncio.TimerHandle] = {}
+        self._poll_times: deque[float] = deque()
+
+    @property
+    def polls_per_second(self) -> float:
+        """Return the measured poll rate over the last POLL_RATE_WINDOW seconds."""
+        self._trim_poll_times(self.hass.loop.time())
+        if not self._poll_times:
+            return 0.0
+        window = min(POLL_RATE_WINDOW, self.hass.loop.time() - self._epoch) or 1.0
+        return len(self._poll_times) / window
+
+    @property
+    def planned_polls_per_second(self) -> float:
+        """Return the poll rate the current intervals add up to."""
+        return sum(1 / coordinator.poll_interval for coordinator in self._phases)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the scheduler state for diagnostics."""
+        return {
+            "coordinators": len(self._phases),
+            "max_concurrent_polls": self.max_concurrent,
+            "planned_polls_per_second": round(self.planned_polls_per_second, 3),
+            "polls_per_second": round(self.polls_per_second, 3),
+        }
+
+    @callback
+    def async_add(self, coordinator: BlynkCoordinator) -> CALLBACK_TYPE:
+        """Start scheduling a coordinator and return a callback to remove it."""
+        self._phases[coordinator] = 0.0
+        self._async_rebalance()
+        if coordinator.stale:
+            # Saklanan veriyle başlayan cihaz hemen yoklanır; eşzamanlılığı limiter sınırlar
+            self._timers.pop(coordinator).cancel()
+            self._async_poll(coordinator)
+        return partial(self._async_remove, coordinator)
+
+    @callback
+    def _async_remove(self, coordinator: BlynkCoordinator) -> None:
+        """Stop scheduling a coordinator."""
+        self._phases.pop(coordinator, None)
+        if timer := self._timers.pop(coordinator, None):
+            timer.cancel()
+        self._async_rebalance()
+
+    @callback
+    def async_reschedule(self, coordinator: BlynkCoordinator) -> None:
+        """Move the next poll of a coordinator to match its current interval."""
+        if coordinator in self._phases:
+            self._async_schedule(coordinator)
+
+    @callback
+    def _async_rebalance(self) -> None:
+        """Assign evenly spaced phases to coordinators sharing an interval."""
+        groups: dict[float, list[BlynkCoordinator]] = defaultdict(list)
+        for coordinator in self._phases:
+            groups[coordinator.poll_interval].append(coordinator)
+
+        for group in groups.values():
+            slots = len(group)
+            for index, coordinator in enumerate(group):
+                jitter = random.uniform(-POLL_JITTER, POLL_JITTER)
+                self._phases[coordinator] = ((index + jitter) / slots) % 1.0
+                self._async_schedule(coordinator)
+
+        _LOGGER.debug(
+            "Scheduling %d Blynk coordinators, planned rate %.3f polls/s",
+            len(self._phases),
+            self.planned_polls_per_second,
+        )
+
+    @callback
+    def _async_schedule(
+        self, coordinator: BlynkCoordinator, not_before: float | None = None
+    ) -> None:
+        """Schedule the next poll of a coordinator at its phase."""
+        if timer := self._timers.pop(coordinator, None):
+            timer.cancel()
+        interval = coordinator.poll_interval
+        now = self.hass.loop.time()
+        offset = self._phases[coordinator] * interval
+        delay = interval - (now - self._epoch - offset) % interval
+        if not_before is not None and now + delay < not_before:
+            # Aralık değiştiyse bir sonraki faz hemen gelebilir; en az yarım aralık bekle
+            delay += interval * math.ceil((not_before - now - delay) / interval)
+        self._timers[coordinator] = self.hass.loop.call_at(
+            now + delay, self._async_poll, coordinator
+        )
+
+    @callback
+    def _async_poll(self, coordinator: BlynkCoordinator) -> None:
+        """Start a scheduled poll."""
+        self._timers.pop(coordinator, None)
+        coordinator.entry.async_create_background_task(
+            self.hass,
+            self._async_run_poll(coordinator),
+            f"{coordinator.name} scheduled poll",
+        )
+
+    async def _async_run_poll(self, coordinator: BlynkCoordinator) -> None:
+        """Refresh a coordinator and schedule its next poll."""
+        now = self.hass.loop.time()
+        self._poll_times.append(now)
+        self._trim_poll_times(now)
+        try:
+            await coordinator.async_scheduled_refresh()
+        finally:
+            if coordinator in self._phases and coordinator not in self._timers:
+                self._async_schedule(
+                    coordinator, not_before=now + coordinator.poll_interval / 2
+                )
+
+    def _trim_poll_times(self, now: float) -> None:
+        """Drop poll timestamps that fell out of the rate window."""
+        while self._poll_times and self._poll_times[0] < now - POLL_RATE_WINDOW:
+            self._poll_times.popleft()
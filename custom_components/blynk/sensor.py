@@ -1,8 +1,21 @@
 """Support for Blynk sensors."""
-from homeassistant.components.sensor import SensorEntity
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 import logging
 from .const import (
     DOMAIN,
@@ -10,9 +23,12 @@ from .const import (
     SENSOR_DEVICE_CLASSES,
     COMMON_UNITS,
     CONF_DEVICE_CLASS,
-    CONF_UNIT
+    CONF_UNIT,
+    CONF_TELEMETRY,
+    DEFAULT_TELEMETRY,
 )
 from . import BlynkEntity
+from .coordinator import BlynkCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,62 +44,133 @@ class BlynkSensor(BlynkEntity, SensorEntity):
         self._attr_device_class = SENSOR_DEVICE_CLASSES.get(device_class)
         self._attr_native_unit_of_measurement = COMMON_UNITS.get(config.get(CONF_UNIT))
 
-    def _parse_value(self, value):
-        """Parse value from Blynk, handling different formats."""
-        if value is None:
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        if not self.coordinator.data:
             return None
-            
-        _LOGGER.debug("Raw value from Blynk: %s (type: %s)", value, type(value))
-        
-        # Eğer zaten numeric ise direkt döndür
-        if isinstance(value, (int, float)):
-            return value
-            
-        # String ise parse et
-        if isinstance(value, str):
-            # Boş string kontrolü
-            value = value.strip()
-            if not value:
-                return None
-                
-            try:
-                # Önce virgülü noktaya çevir (Türkçe format)
-                if ',' in value and '.' not in value:
-                    value = value.replace(',', '.')
-                    _LOGGER.debug("Converted comma to dot: %s", value)
-                
-                # Eğer hem virgül hem nokta varsa (örn: 1,234.56)
-                elif ',' in value and '.' in value:
-                    # Son noktadan önce virgül varsa, binlik ayracı olarak kabul et
-                    last_dot = value.rfind('.')
-                    if ',' in value[:last_dot]:
-                        # Virgülleri kaldır (binlik ayracı)
-                        value = value.replace(',', '')
-                        _LOGGER.debug("Removed thousand separators: %s", value)
-                
-                # Float'a çevir
-                parsed_value = float(value)
-                _LOGGER.debug("Parsed value: %s", parsed_value)
-                return parsed_value
-                
-            except ValueError as e:
-                _LOGGER.warning("Could not parse sensor value '%s': %s", value, e)
-                return value  # Parse edilemezse orijinal değeri döndür
-        
-        # Diğer türler için
-        return value
+        return self.coordinator.data.get(self._pin)
+
+
+@dataclass(frozen=True, kw_only=True)
+class BlynkTelemetrySensorDescription(SensorEntityDescription):
+    """Describes a Blynk telemetry sensor."""
+
+    value_fn: Callable[[BlynkCoordinator], Any]
+    attributes_fn: Callable[[BlynkCoordinator], dict[str, Any]] | None = None
+
+
+TELEMETRY_SENSORS: tuple[BlynkTelemetrySensorDescription, ...] = (
+    BlynkTelemetrySensorDescription(
+        key="last_poll_duration",
+        translation_key="last_poll_duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=3,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.telemetry.last_poll_duration,
+    ),
+    BlynkTelemetrySensorDescription(
+        key="latency_p95",
+        translation_key="latency_p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=3,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.telemetry.latency_p95,
+    ),
+    BlynkTelemetrySensorDescription(
+        key="write_latency",
+        translation_key="write_latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=3,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.telemetry.write_latency,
+        attributes_fn=lambda coordinator: {
+            pin: stats.as_dict() for pin, stats in coordinator.api.write_stats.items()
+        },
+    ),
+    BlynkTelemetrySensorDescription(
+        key="requests",
+        translation_key="requests",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.telemetry.requests,
+        attributes_fn=lambda coordinator: {
+            "cache_hits": coordinator.api.cache_hits,
+            "cache_misses": coordinator.api.cache_misses,
+            "reads_joined": coordinator.api.reads_joined,
+            "reads_reused": coordinator.api.reads_reused,
+        },
+    ),
+    BlynkTelemetrySensorDescription(
+        key="errors",
+        translation_key="errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.telemetry.errors,
+        attributes_fn=lambda coordinator: coordinator.telemetry.error_counts,
+    ),
+    BlynkTelemetrySensorDescription(
+        key="bytes_received",
+        translation_key="bytes_received",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.telemetry.bytes_received,
+    ),
+    BlynkTelemetrySensorDescription(
+        key="last_success",
+        translation_key="last_success",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda coordinator: coordinator.telemetry.last_success,
+    ),
+    BlynkTelemetrySensorDescription(
+        key="poll_interval",
+        translation_key="poll_interval",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        value_fn=lambda coordinator: coordinator.poll_interval,
+    ),
+)
+
+
+class BlynkTelemetrySensor(CoordinatorEntity[BlynkCoordinator], SensorEntity):
+    """Diagnostic sensor reporting how the device is being polled."""
+
+    entity_description: BlynkTelemetrySensorDescription
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        coordinator: BlynkCoordinator,
+        description: BlynkTelemetrySensorDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = (
+            f"{DOMAIN}_{coordinator.entry.entry_id}_{description.key}"
+        )
+        self._attr_device_info = coordinator.device_info
+
+    @property
+    def available(self) -> bool:
+        """Telemetry stays available while the device is unreachable."""
+        return True
 
     @property
     def native_value(self):
-        """Return the state of the sensor."""
-        if not self.coordinator.data or self._pin not in self.coordinator.data:
+        """Return the current statistic."""
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the per-status breakdown where there is one."""
+        if self.entity_description.attributes_fn is None:
             return None
-        
-        raw_value = self.coordinator.data[self._pin]
-        parsed_value = self._parse_value(raw_value)
-        
-        _LOGGER.debug("Pin %s - Raw: %s, Parsed: %s", self._pin, raw_value, parsed_value)
-        return parsed_value
+        return self.entity_description.attributes_fn(self.coordinator)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -104,5 +191,11 @@ async def async_setup_entry(
                     pin_config,
                 )
             )
+
+    if entry.options.get(CONF_TELEMETRY, DEFAULT_TELEMETRY):
+        entities.extend(
+            BlynkTelemetrySensor(coordinator, description)
+            for description in TELEMETRY_SENSORS
+        )
     
     async_add_entities(entities)
@@ -0,0 +1,183 @@
+"""Services of the Blynk integration."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from functools import partial
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry as dr,
+    entity_registry as er,
+)
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    SERVICE_GET_HISTORY,
+    SERVICE_SET_PINS,
+    SET_PINS_MAX_CONCURRENT,
+)
+from .coordinator import BlynkCoordinator
+from .history import RESOLUTION_RAW, RESOLUTIONS
+
+ATTR_RESOLUTION = "resolution"
+ATTR_DURATION = "duration"
+ATTR_DEVICES = "devices"
+
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Optional(ATTR_RESOLUTION, default=RESOLUTION_RAW): vol.In(RESOLUTIONS),
+        vol.Optional(ATTR_DURATION, default=timedelta(hours=1)): cv.positive_time_period,
+    }
+)
+
+_PIN_VALUE = vol.Any(vol.All(bool, vol.Coerce(int)), int, float, str)
+
+SET_PINS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICES): vol.All(
+            {cv.string: vol.All({cv.string: _PIN_VALUE}, vol.Length(min=1))},
+            vol.Length(min=1),
+        ),
+    }
+)
+
+
+def _entity_pin(unique_id: str) -> str:
+    """Return the pin of a Blynk entity from its unique id.
+
+    Pin entities use "blynk_<pin>" with an optional "_<platform>" suffix.
+    """
+    return unique_id.removeprefix(f"{DOMAIN}_").split("_", 1)[0]
+
+
+async def _async_get_history(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Return the in-memory history of the given entities."""
+    registry = er.async_get(hass)
+    resolution = call.data[ATTR_RESOLUTION]
+    since = (dt_util.utcnow() - call.data[ATTR_DURATION]).timestamp()
+
+    response: dict[str, Any] = {}
+    for entity_id in call.data[ATTR_ENTITY_ID]:
+        entity = registry.async_get(entity_id)
+        if entity is None or entity.platform != DOMAIN:
+            raise ServiceValidationError(f"{entity_id} is not a Blynk entity")
+        entry_data = hass.data[DOMAIN].get(entity.config_entry_id)
+        if entry_data is None:
+            raise ServiceValidationError(f"The device of {entity_id} is not loaded")
+
+        rows = entry_data["coordinator"].history.query(
+            _entity_pin(entity.unique_id), resolution, since
+        )
+        if resolution == RESOLUTION_RAW:
+            samples = [
+                {"time": dt_util.utc_from_timestamp(time).isoformat(), "value": value}
+                for time, value in rows
+            ]
+        else:
+            samples = [
+                {
+                    "time": dt_util.utc_from_timestamp(time).isoformat(),
+                    "min": minimum,
+                    "mean": mean,
+                    "max": maximum,
+                }
+                for time, minimum, mean, maximum in rows
+            ]
+        response[entity_id] = samples
+    return response
+
+
+def _device_coordinator(hass: HomeAssistant, device: str) -> BlynkCoordinator:
+    """Return the coordinator of a Blynk config entry id or device id."""
+    entries = hass.data.get(DOMAIN, {})
+    entry_data = entries.get(device)
+    if entry_data is None and (device_entry := dr.async_get(hass).async_get(device)):
+        entry_data = next(
+            (entries[entry_id] for entry_id in device_entry.config_entries if entry_id in entries),
+            None,
+        )
+    if not isinstance(entry_data, dict):
+        raise ServiceValidationError(f"{device} is not a loaded Blynk device")
+    return entry_data["coordinator"]
+
+
+async def _async_set_pins(
+    hass: HomeAssistant, limit: asyncio.Semaphore, call: ServiceCall
+) -> ServiceResponse:
+    """Write the pins of several devices, one batch request per device.
+
+    Devices are written concurrently, at most SET_PINS_MAX_CONCURRENT at a
+    time across all calls. Each device confirms its pins with one read.
+    """
+    targets: dict[str, tuple[BlynkCoordinator, dict[str, Any]]] = {}
+    for device, pins in call.data[ATTR_DEVICES].items():
+        coordinator = _device_coordinator(hass, device)
+        values = {pin.strip().upper(): value for pin, value in pins.items()}
+        if unknown := values.keys() - coordinator.pin_configs.keys():
+            raise ServiceValidationError(
+                f"{', '.join(sorted(unknown))} not configured for {device}"
+            )
+        targets[device] = (coordinator, values)
+
+    async def _async_write(
+        coordinator: BlynkCoordinator, values: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Write one device and report the outcome."""
+        async with limit:
+            start = time.perf_counter()
+            try:
+                await coordinator.async_write_pins(values)
+            except HomeAssistantError as err:
+                return {
+                    "success": False,
+                    "latency": round(time.perf_counter() - start, 3),
+                    "error": str(err),
+                }
+            return {"success": True, "latency": round(time.perf_counter() - start, 3)}
+
+    results = dict(
+        zip(
+            targets,
+            await asyncio.gather(
+                *(_async_write(coordinator, values) for coordinator, values in targets.values())
+            ),
+        )
+    )
+    if call.return_response:
+        return results
+    if failed := [device for device, result in results.items() if not result["success"]]:
+        raise HomeAssistantError(f"Failed to set pins of {', '.join(failed)}")
+    return None
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Blynk services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        partial(_async_get_history, hass),
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_PINS,
+        partial(_async_set_pins, hass, asyncio.Semaphore(SET_PINS_MAX_CONCURRENT)),
+        schema=SET_PINS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,91 @@
+"""Performance telemetry for Blynk devices."""
+from __future__ import annotations
+
+from collections import Counter, deque
+from datetime import datetime
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import TELEMETRY_SAMPLES
+
+WRITE_ENDPOINTS = frozenset(("update", "batch/update"))
+
+
+def _percentile(samples: deque[float], percent: float) -> float | None:
+    """Return a percentile of the samples, or None without samples."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))]
+
+
+class BlynkTelemetry:
+    """Request and poll statistics of one device.
+
+    Fed by BlynkCloudAPI.request_hook and by the coordinator after every
+    poll. Latencies are kept in bounded windows of TELEMETRY_SAMPLES.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.requests = 0
+        self.bytes_received = 0
+        self.status_counts: Counter[str] = Counter()
+        self.last_poll_duration: float | None = None
+        self.last_success: datetime | None = None
+        self._latencies: deque[float] = deque(maxlen=TELEMETRY_SAMPLES)
+        self._write_latencies: deque[float] = deque(maxlen=TELEMETRY_SAMPLES)
+
+    @property
+    def errors(self) -> int:
+        """Return the number of requests that did not return HTTP 200."""
+        return self.requests - self.status_counts["200"]
+
+    @property
+    def error_counts(self) -> dict[str, int]:
+        """Return error counts by HTTP status or failure kind."""
+        return {
+            status: count
+            for status, count in self.status_counts.items()
+            if status != "200"
+        }
+
+    @property
+    def latency_p95(self) -> float | None:
+        """Return the 95th percentile request latency in seconds."""
+        return _percentile(self._latencies, 95)
+
+    @property
+    def write_latency(self) -> float | None:
+        """Return the median write latency in seconds."""
+        return _percentile(self._write_latencies, 50)
+
+    def record_request(
+        self, endpoint: str, status: int | str, latency: float, size: int
+    ) -> None:
+        """Record one HTTP request attempt."""
+        self.requests += 1
+        self.bytes_received += size
+        self.status_counts[str(status)] += 1
+        self._latencies.append(latency)
+        if endpoint in WRITE_ENDPOINTS:
+            self._write_latencies.append(latency)
+
+    def record_poll(self, duration: float, success: bool) -> None:
+        """Record one coordinator poll."""
+        self.last_poll_duration = duration
+        if success:
+            self.last_success = dt_util.utcnow()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics for diagnostics."""
+        return {
+            "requests": self.requests,
+            "errors": self.error_counts,
+            "bytes_received": self.bytes_received,
+            "latency_p95": self.latency_p95,
+            "write_latency": self.write_latency,
+            "last_poll_duration": self.last_poll_duration,
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+        }
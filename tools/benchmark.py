@@ -0,0 +1,244 @@
+"""Benchmark the Blynk API client against the local stand-in server.
+
+Polls 1, 10 and 500 devices through BlynkCloudAPI the way the
+coordinator does (multi-pin read, decode into a snapshot, concurrency
+capped like the poll scheduler) and reports, per fleet size:
+
+- HTTP requests per second and p50/p99 poll latency
+- peak traced memory and net allocated blocks per poll
+- event-loop CPU time per poll
+
+The stand-in runs in a separate process, so CPU time is the client's
+own. Clients are built without the read freshness window and their read
+cache is cleared before every round, so every poll reaches the stand-in
+and decodes its response; req/s counts the HTTP requests actually sent. Requires Home Assistant to be importable, like the integration.
+
+    python tools/benchmark.py --devices 1,10,500 --rounds 5 --pins 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+from pathlib import Path
+import socket
+import statistics
+import sys
+import time
+import tracemalloc
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from blynk_standin import API_PREFIX, BlynkStandin, StandinConfig  # noqa: E402
+from custom_components.blynk.blynk_api import BlynkCloudAPI  # noqa: E402
+from custom_components.blynk.const import (  # noqa: E402
+    CONNECTION_LIMIT_PER_HOST,
+    DNS_CACHE_TTL,
+    KEEPALIVE_TIMEOUT,
+    MAX_CONCURRENT_POLLS,
+    PIN_TYPE_SENSOR,
+)
+from custom_components.blynk.decoders import (  # noqa: E402
+    build_decoders,
+    decode_snapshot,
+)
+
+
+def _serve(port: int, config: StandinConfig) -> None:
+    """Run the stand-in in a child process."""
+    web.run_app(
+        BlynkStandin(config).make_app(), host="127.0.0.1", port=port, print=None
+    )
+
+
+def _free_port() -> int:
+    """Return a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, timeout: float = 10.0) -> None:
+    """Block until the stand-in accepts connections."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("Stand-in server did not start")
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    """Return the given percentile of values."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def _run_rounds(
+    apis: list[BlynkCloudAPI], pins: list[str], rounds: int
+) -> tuple[list[float], int]:
+    """Poll every device for a number of rounds; return latencies and failures.
+
+    The read cache of every client is cleared before each round, so polls
+    are not answered from the previous round's responses.
+    """
+    decoders = build_decoders({pin: {"pin_type": PIN_TYPE_SENSOR} for pin in pins})
+    limiter = asyncio.Semaphore(MAX_CONCURRENT_POLLS)
+    latencies: list[float] = []
+    failures = 0
+
+    async def poll(api: BlynkCloudAPI) -> None:
+        nonlocal failures
+        async with limiter:
+            start = time.perf_counter()
+            raw = await api.get_pins(pins)
+            decode_snapshot(decoders, raw)
+            latencies.append(time.perf_counter() - start)
+            if not raw:
+                failures += 1
+
+    for _ in range(rounds):
+        for api in apis:
+            api.clear_read_cache()
+        await asyncio.gather(*(poll(api) for api in apis))
+    return latencies, failures
+
+
+async def run_scenario(
+    base_url: str, devices: int, pins: int, rounds: int
+) -> dict[str, float]:
+    """Benchmark one fleet size and return its metrics."""
+    connector = aiohttp.TCPConnector(
+        limit_per_host=CONNECTION_LIMIT_PER_HOST,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    requests = 0
+
+    def count_request(*_: object) -> None:
+        """Count every HTTP request attempt, retries included."""
+        nonlocal requests
+        requests += 1
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+        apis = []
+        for index in range(devices):
+            # Yoklamalar ortak okuma penceresinden değil sunucudan yanıtlanmalı
+            api = BlynkCloudAPI(f"bench-token-{index:04d}", session, read_freshness=0)
+            api.base_url = base_url
+            api.request_hook = count_request
+            apis.append(api)
+        pin_names = [f"V{index}" for index in range(pins)]
+
+        # Bağlantı havuzunu ısıt
+        await _run_rounds(apis, pin_names, 1)
+
+        requests = 0
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        latencies, failures = await _run_rounds(apis, pin_names, rounds)
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        sent = requests
+
+        tracemalloc.start()
+        blocks_start = sys.getallocatedblocks()
+        await _run_rounds(apis, pin_names, 1)
+        blocks = sys.getallocatedblocks() - blocks_start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    polls = len(latencies)
+    return {
+        "devices": devices,
+        "polls": polls,
+        "requests": sent,
+        "failures": failures,
+        "req_per_s": sent / wall,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "peak_kib": peak / 1024,
+        "blocks_per_poll": blocks / devices,
+        "cpu_ms_per_poll": cpu / polls * 1000,
+    }
+
+
+def _print_table(results: list[dict[str, float]]) -> None:
+    """Print results as an aligned table."""
+    columns = [
+        ("devices", "{:>7d}"),
+        ("polls", "{:>6d}"),
+        ("requests", "{:>8d}"),
+        ("failures", "{:>8d}"),
+        ("req_per_s", "{:>9.1f}"),
+        ("p50_ms", "{:>7.2f}"),
+        ("p99_ms", "{:>7.2f}"),
+        ("peak_kib", "{:>8.1f}"),
+        ("blocks_per_poll", "{:>15.1f}"),
+        ("cpu_ms_per_poll", "{:>15.3f}"),
+    ]
+    print(" ".join(f"{name:>{len(fmt.format(0))}}" for name, fmt in columns))
+    for result in results:
+        print(
+            " ".join(
+                fmt.format(int(result[name]) if "d" in fmt else result[name])
+                for name, fmt in columns
+            )
+        )
+
+
+def _parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", default="1,10,500")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--pins", type=int, default=20)
+    parser.add_argument("--device-pins", type=int, default=60)
+    parser.add_argument("--payload", default="mixed")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--change-rate", type=float, default=0.0)
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Start the stand-in, run every fleet size and print the results."""
+    args = _parse_args()
+    config = StandinConfig(
+        pins=args.device_pins,
+        payload=args.payload,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=0.1,
+        change_rate=args.change_rate,
+        seed=1,
+    )
+    port = _free_port()
+    server = multiprocessing.Process(target=_serve, args=(port, config), daemon=True)
+    server.start()
+    try:
+        _wait_for_port(port)
+        base_url = f"http://127.0.0.1:{port}{API_PREFIX}"
+        results = [
+            asyncio.run(run_scenario(base_url, int(devices), args.pins, args.rounds))
+            for devices in args.devices.split(",")
+        ]
+    finally:
+        server.terminate()
+        server.join()
+    _print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Local stand-in for the Blynk Cloud HTTP API.
+
+Serves the getAll, get, update, batch/update and isHardwareConnected
+endpoints for any number of device tokens, with configurable pin counts,
+payload shapes, latency, error rates, rate limiting and a share of
+devices whose hardware is offline. Used by the benchmark suite and for
+exercising the integration without blynk.cloud.
+
+    python tools/blynk_standin.py --port 8080 --pins 60 --latency 0.02
+
+Point the integration at it by entering http://127.0.0.1:8080/external/api
+as the server of a device.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+import json
+import random
+
+from aiohttp import web
+
+API_PREFIX = "/external/api"
+
+PAYLOAD_SHAPES = ("numeric", "text", "mixed")
+
+
+@dataclass
+class StandinConfig:
+    """Behaviour of the stand-in server."""
+
+    pins: int = 20
+    payload: str = "mixed"
+    latency: float = 0.0  # seconds added to every response
+    jitter: float = 0.0  # extra random latency, seconds
+    error_rate: float = 0.0  # fraction of requests answered with HTTP 500
+    rate_limit_rate: float = 0.0  # fraction of requests answered with HTTP 429
+    retry_after: float = 1.0  # Retry-After of 429 responses, seconds
+    change_rate: float = 0.0  # fraction of pins changing between reads
+    offline_rate: float = 0.0  # fraction of devices whose hardware is offline
+    seed: int | None = None
+
+
+class BlynkStandin:
+    """In-memory Blynk cloud with one pin table per device token."""
+
+    def __init__(self, config: StandinConfig | None = None) -> None:
+        """Initialize the stand-in."""
+        self.config = config or StandinConfig()
+        self.devices: dict[str, dict[str, str]] = {}
+        self.hardware_connected: dict[str, bool] = {}
+        self.stats: Counter[str] = Counter()
+        self._random = random.Random(self.config.seed)
+
+    def _value(self, index: int) -> str:
+        """Return a fresh value for the pin at index."""
+        shape = self.config.payload
+        if shape == "mixed":
+            shape = PAYLOAD_SHAPES[index % 2]
+        if shape == "numeric":
+            return f"{self._random.uniform(-50, 150):.2f}"
+        return f"state-{self._random.randrange(1000)}"
+
+    def device(self, token: str) -> dict[str, str]:
+        """Return the pin table of a device, creating it on first use."""
+        if token not in self.devices:
+            self.devices[token] = {
+                f"v{index}": self._value(index) for index in range(self.config.pins)
+            }
+            self.hardware_connected.setdefault(
+                token, self._random.random() >= self.config.offline_rate
+            )
+        return self.devices[token]
+
+    def _churn(self, pins: dict[str, str]) -> None:
+        """Change a fraction of the pin values between reads."""
+        if not self.config.change_rate:
+            return
+        for index, pin in enumerate(pins):
+            if self._random.random() < self.config.change_rate:
+                pins[pin] = self._value(index)
+
+    def make_app(self) -> web.Application:
+        """Return the aiohttp application serving the API."""
+        app = web.Application()
+        app.router.add_get(f"{API_PREFIX}/{{endpoint:.*}}", self._handle)
+        return app
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        """Answer one API request."""
+        config = self.config
+        endpoint = request.match_info["endpoint"]
+        self.stats[endpoint] += 1
+        delay = config.latency + self._random.uniform(0, config.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        roll = self._random.random()
+        if roll < config.rate_limit_rate:
+            self.stats["429"] += 1
+            return web.Response(
+                status=429, headers={"Retry-After": f"{config.retry_after:g}"}
+            )
+        if roll < config.rate_limit_rate + config.error_rate:
+            self.stats["500"] += 1
+            return web.Response(status=500, text="Internal error")
+
+        token = request.query.get("token")
+        if not token:
+            return web.Response(status=400, text="Invalid token.")
+        pins = self.device(token)
+        requested = [key for key in request.query if key != "token"]
+
+        if endpoint == "getAll":
+            self._churn(pins)
+            return web.json_response(pins)
+        if endpoint == "get":
+            self._churn(pins)
+            if len(requested) == 1:
+                return web.Response(text=pins.get(requested[0].lower(), ""))
+            return web.json_response(
+                {pin.lower(): pins.get(pin.lower()) for pin in requested}
+            )
+        if endpoint == "isHardwareConnected":
+            return web.Response(text=str(self.hardware_connected[token]).lower())
+        if endpoint in ("update", "batch/update"):
+            for pin in requested:
+                pins[pin.lower()] = request.query[pin]
+            return web.Response()
+        return web.Response(status=404, text="Unknown endpoint.")
+
+
+def _parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--pins", type=int, default=StandinConfig.pins)
+    parser.add_argument("--payload", choices=PAYLOAD_SHAPES, default="mixed")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--change-rate", type=float, default=0.0)
+    parser.add_argument("--offline-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    return parser.parse_args()
+
+
+def config_from_args(args: argparse.Namespace) -> StandinConfig:
+    """Build a stand-in configuration from parsed arguments."""
+    return StandinConfig(
+        pins=args.pins,
+        payload=args.payload,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        change_rate=args.change_rate,
+        offline_rate=args.offline_rate,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    """Run the stand-in server."""
+    args = _parse_args()
+    standin = BlynkStandin(config_from_args(args))
+    print(json.dumps({"url": f"http://{args.host}:{args.port}{API_PREFIX}"}))
+    web.run_app(standin.make_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Benchmark the memory and state-read cost of Blynk entities.
+
+Builds 5,000 entities (50 devices with 100 pins, a mix of sensors,
+binary sensors, switches, numbers and text inputs) and reports:
+
+- traced memory per entity, including its device and coordinator share
+- time per state read (state, availability, attributes and device
+  info, i.e. what a state write asks the entity for)
+
+--source points at another checkout of the repository, so the numbers of
+two revisions can be compared:
+
+    git worktree add /tmp/blynk-before <commit>
+    python tools/entity_benchmark.py --source /tmp/blynk-before
+    python tools/entity_benchmark.py
+
+Requires Home Assistant to be importable, like the integration. No
+requests are made.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import inspect
+import json
+import logging
+from pathlib import Path
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+PIN_TYPES = ("sensor", "binary_sensor", "switch", "input_number", "input_text")
+
+
+def _parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--source",
+        default=str(Path(__file__).resolve().parents[1]),
+        help="repository checkout whose custom_components/blynk is measured",
+    )
+    parser.add_argument("--devices", type=int, default=50)
+    parser.add_argument("--pins", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=20)
+    return parser.parse_args()
+
+
+def _pin_configs(pins: int) -> dict[str, dict[str, Any]]:
+    """Return pin configurations cycling through the pin types."""
+    return {
+        f"V{index}": {
+            "pin_type": PIN_TYPES[index % len(PIN_TYPES)],
+            "pin_name": f"Pin {index}",
+            "device_class": "none",
+            "unit": "none",
+        }
+        for index in range(pins)
+    }
+
+
+def _raw_values(pins: int) -> dict[str, str]:
+    """Return raw pin values matching the pin types."""
+    values = {}
+    for index in range(pins):
+        pin_type = PIN_TYPES[index % len(PIN_TYPES)]
+        if pin_type in ("binary_sensor", "switch"):
+            values[f"V{index}"] = str(index % 2)
+        elif pin_type == "input_text":
+            values[f"V{index}"] = f"text {index}"
+        else:
+            values[f"V{index}"] = f"{index * 1.5:.2f}"
+    return values
+
+
+def _make_coordinator(hass, blynk, token: str, pins: dict[str, dict[str, Any]]):
+    """Return a coordinator holding one poll of the device.
+
+    Uses BlynkCoordinator where the checkout has one and the plain
+    DataUpdateCoordinator of older revisions otherwise.
+    """
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+    raw = _raw_values(len(pins))
+    try:
+        from custom_components.blynk.coordinator import BlynkCoordinator
+        from custom_components.blynk.decoders import build_decoders, decode_snapshot
+        from custom_components.blynk.scheduler import BlynkPollScheduler
+    except ImportError:
+        coordinator = DataUpdateCoordinator(
+            hass, logging.getLogger(__name__), name=token[:8]
+        )
+        coordinator.async_set_updated_data(raw)
+        return coordinator, None
+
+    entry_args = {
+        "version": 8,
+        "domain": "blynk",
+        "title": token,
+        "data": {"token": token, "scan_interval": 30, "pins": pins},
+        "source": "user",
+        "options": {},
+    }
+    if "minor_version" in inspect.signature(ConfigEntry).parameters:
+        entry_args["minor_version"] = 1
+    entry = ConfigEntry(**entry_args)
+    api = blynk.BlynkCloudAPI(token, None)
+    scheduler = hass.data.setdefault("_bench_scheduler", BlynkPollScheduler(hass))
+    coordinator = BlynkCoordinator(hass, entry, api, scheduler)
+    coordinator.async_set_updated_data(decode_snapshot(build_decoders(pins), raw))
+    return coordinator, api
+
+
+def _make_entities(coordinator, api, pins: dict[str, dict[str, Any]]) -> list:
+    """Create the entity of every pin the way the platforms do."""
+    from custom_components.blynk.binary_sensor import BlynkBinarySensor
+    from custom_components.blynk.number import BlynkNumber
+    from custom_components.blynk.sensor import BlynkSensor
+    from custom_components.blynk.switch import BlynkSwitch
+    from custom_components.blynk.text import BlynkText
+
+    classes = {
+        "sensor": BlynkSensor,
+        "binary_sensor": BlynkBinarySensor,
+        "switch": BlynkSwitch,
+        "input_number": BlynkNumber,
+        "input_text": BlynkText,
+    }
+    entities = []
+    for pin, config in pins.items():
+        cls = classes[config["pin_type"]]
+        if "api" in inspect.signature(cls.__init__).parameters:
+            entities.append(cls(coordinator, api, pin, config))
+        else:
+            entities.append(cls(coordinator, pin, config))
+    return entities
+
+
+def _read_state(entity) -> None:
+    """Read what a state write asks an entity for."""
+    if entity.available:
+        entity.state
+    entity.extra_state_attributes
+    entity.device_info
+    entity.unique_id
+
+
+async def _async_main(args: argparse.Namespace) -> dict[str, Any]:
+    """Build the entities and measure them."""
+    from homeassistant.core import HomeAssistant
+
+    import custom_components.blynk.blynk_api as blynk
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        pins = _pin_configs(args.pins)
+
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        devices = [
+            _make_coordinator(hass, blynk, f"token{index:04d}abcdefgh", pins)
+            for index in range(args.devices)
+        ]
+        entities = [
+            entity
+            for coordinator, api in devices
+            for entity in _make_entities(coordinator, api, pins)
+        ]
+        for entity in entities:
+            entity.hass = hass
+        gc.collect()
+        memory = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+
+        timings = []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            for entity in entities:
+                _read_state(entity)
+            timings.append(time.perf_counter() - start)
+
+        await hass.async_stop(force=True)
+
+    return {
+        "source": args.source,
+        "entities": len(entities),
+        "bytes_per_entity": round(memory / len(entities)),
+        "state_read_us": round(min(timings) / len(entities) * 1e6, 2),
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print the results as JSON."""
+    args = _parse_args()
+    sys.path.insert(0, str(Path(args.source).resolve()))
+    logging.basicConfig(level=logging.WARNING)
+    print(json.dumps(asyncio.run(_async_main(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()